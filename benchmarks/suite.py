@@ -0,0 +1,617 @@
+# Headless benchmark suite for guiABLE's hot paths. Every case runs in its own process, so peak RSS is per case,
+# and records wall time, Tcl round trips (calls through the interpreter) and peak RSS, plus whatever else the case
+# measures itself. New measurements go here as cases, not in scripts of their own.
+#
+#   python benchmarks/suite.py --json before.json          run everything, write results
+#   python benchmarks/suite.py --json after.json hover_storm_200x20 skin_draw_600
+#   python benchmarks/suite.py --compare before.json after.json [--threshold 0.1]
+#
+# With no $DISPLAY the suite starts its own Xvfb (which must be installed) for the duration of the run.
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tkinter as tk
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import guiABLE
+
+
+def _brushFiles(folder):
+    paths = []
+    for n, (width, height) in enumerate(((16, 1), (16, 6)) * 4):
+        brush = tk.PhotoImage(width=width, height=height)
+        brush.put(" ".join("{" + " ".join("#%02x%02x%02x" % ((x * 16 + n * 30) % 256, (y * 40) % 256, 128)
+                                          for x in range(width)) + "}" for y in range(height)))
+        paths.append(os.path.join(folder, f"brush{n}.png"))
+        brush.write(paths[-1], format="png")
+    return paths
+
+
+def _buttonFiles(folder, count=4):
+    paths = []
+    for n in range(count):
+        image = tk.PhotoImage(width=40, height=20)
+        image.put("#%02x%02x%02x" % (60 * n, 90, 200 - 40 * n), to=(0, 0, 40, 20))
+        paths.append(os.path.join(folder, f"button{n}.png"))
+        image.write(paths[-1], format="png")
+    return paths
+
+
+def _pane(root, rows=2000, width=300, height=400):
+    pane = guiABLE.ScrollablePane(root, width, height, 16, (False, True), (False, True))
+    pane.pack()
+    for n in range(rows):
+        tk.Label(pane.inner, text=f"row {n}", anchor=tk.W).place(x=0, y=n * 20, width=width - 16, height=20)
+    pane.inner.place_configure(x=0, y=0, width=width - 16, height=rows * 20)
+    root.update()
+    return pane
+
+
+def construct(widget_class, count):
+    def case(root, folder):
+        paths = _buttonFiles(folder)
+        kwargs = {"image_paths1": paths, "image_paths2": paths[::-1]} if widget_class is guiABLE.Toggleable \
+            else {"image_paths": paths}
+
+        def run():
+            for n in range(count):
+                widget_class(root, width=40, height=20, **kwargs).place(x=(n % 25) * 42, y=(n // 25) * 22)
+            root.update()
+            return count
+        return run
+    return case
+
+
+def constructItems(count, columns=100):
+    def case(root, folder):
+        paths = _buttonFiles(folder)
+        host = guiABLE.ItemHost(root, width=columns * 10, height=(count // columns + 1) * 10)
+        host.pack()
+        root.update()
+
+        def run():
+            for n in range(count):
+                guiABLE.PushItem(host, image_paths=paths, width=10, height=10).place(x=(n % columns) * 10,
+                                                                                     y=(n // columns) * 10)
+            root.update()
+            return count
+        return run
+    return case
+
+
+def constructBatch(count):
+    def case(root, folder):
+        paths = _buttonFiles(folder)
+
+        def run():
+            def make(n):
+                widget = guiABLE.Toggleable(root, image_paths1=paths, image_paths2=paths[::-1], width=40, height=20)
+                widget.place(x=(n % 25) * 42, y=(n // 25) * 22)
+                return widget
+            guiABLE.buildMany(make, count)
+            root.update()
+            return count
+        return run
+    return case
+
+
+def troughStorm(rounds):
+    def case(root, folder):
+        bar = guiABLE.Scrollable(root, 16, 400, 16, 100)
+        bar.pack()
+        root.update()
+        bar.setSkin(guiABLE.ScrollSkin(_brushFiles(folder), _brushFiles(folder)))
+        bar._skin.drawTo(bar)
+        trough = bar.trough
+
+        def run():
+            for n in range(rounds):
+                trough.mouseIn(None)
+                trough.clicked(None)
+                trough.mouseUp(None)
+                trough.mouseOut(None)
+            root.update()
+            return rounds * 4
+        return run
+    return case
+
+
+def skinLoad(count, atlas):
+    # Cold-loading a skin of 'count' images through the cache, from loose files or from one packed atlas.
+    def case(root, folder):
+        paths = []
+        for n in range(count):
+            image = tk.PhotoImage(width=48, height=24)
+            image.put("#%02x%02x%02x" % (n % 256, (n * 7) % 256, (n * 13) % 256), to=(0, 0, 48, 24))
+            paths.append(os.path.join(folder, f"state{n:04d}.png"))
+            image.write(paths[-1], format="png")
+        if atlas:
+            index = os.path.join(folder, "skin.json")
+            guiABLE.packAtlas(paths, index)
+            paths = guiABLE.atlasPaths(index, *[os.path.splitext(os.path.basename(p))[0] for p in paths])
+        guiABLE.image_cache.clear()
+
+        def run():
+            for image in [guiABLE.image_cache.get(path) for path in paths]:
+                guiABLE.image_cache.release(image)
+            return count
+        return run
+    return case
+
+
+def bundleOpen(shown, themed):
+    def case(root, folder):
+        paths = []
+        for n in range(themed):
+            image = tk.PhotoImage(width=40, height=20)
+            image.put("#%02x%02x%02x" % (n % 256, 90, 200), to=(0, 0, 40, 20))
+            paths.append(os.path.join(folder, f"button{n}.png"))
+            image.write(paths[-1], format="png")
+        skin_path = os.path.join(folder, "theme.skin")
+        guiABLE.compileSkin({"buttons": {f"b{n}": [path] * 3 for n, path in enumerate(paths)}}, skin_path)
+        guiABLE.image_cache.clear()     # Start cold, as a fresh launch would.
+
+        def run():
+            bundle = guiABLE.SkinBundle(skin_path)
+            for n in range(shown):
+                guiABLE.Pushable(root, image_paths=bundle.button(f"b{n}"), width=40, height=20).place(x=n * 42, y=0)
+            root.update()
+            return shown
+        return run
+    return case
+
+
+def rescale(count):
+    def case(root, folder):
+        paths = _buttonFiles(folder)
+        hidden = tk.Frame(root)     # Never shown: its buttons should only be marked stale.
+        for n in range(count):
+            parent = root if n % 2 else hidden
+            guiABLE.Pushable(parent, image_paths=paths, width=40, height=20).place(x=(n % 25) * 42, y=(n // 50) * 22)
+        root.update()
+
+        def run():
+            for scale in (1.5, 1.25, 2, 1):
+                guiABLE.setScale(scale)
+                root.update()
+            return 4
+        return run
+    return case
+
+
+def skinDraw(length):
+    def case(root, folder):
+        paths = _brushFiles(folder)
+        bar = guiABLE.Scrollable(root, 16, length, 16, length // 3)
+        bar.pack()
+        root.update()
+        skin = guiABLE.ScrollSkin(list(paths), list(paths), cache_size=0)    # No sprite cache: time compositing.
+        bar.setSkin(skin)
+
+        def run(repeat=5):
+            for n in range(repeat):
+                skin.drawTo(bar)
+            return repeat
+        return run
+    return case
+
+
+class _LegacySkin(guiABLE.ScrollSkin):
+    # The per-pixel brush.get() compositor ScrollSkin used before it composited in bulk.
+    def _putToImage(self, brush, canvas, bbox, mirror_x=False, mirror_y=False, rotate=False):
+        value1 = brush.height() if rotate else brush.width()
+        value2 = brush.width() if rotate else brush.height()
+        start1, end1, increment1 = (value1-1, -1, -1) if mirror_x else (0, value1, 1)
+        start2, end2, increment2 = (value2-1, -1, -1) if mirror_y else (0, value2, 1)
+
+        data = ""
+        for col in range(start2, end2, increment2):
+            data = data + "{"
+            for row in range(start1, end1, increment1):
+                data = data + "#%02x%02x%02x " % brush.get(col if rotate else row, row if rotate else col)
+            data = data + "} "
+        canvas.put(data, to=bbox)
+
+
+def composeBar(width, height, legacy=False):
+    # drawBar() alone, no widgets. The bulk case also checks it still draws what the per-pixel path drew.
+    def case(root, folder):
+        brushes = [tk.PhotoImage(file=path) for path in _brushFiles(folder)]
+        skin = (_LegacySkin if legacy else guiABLE.ScrollSkin)([], [])
+        extra = {}
+        if not legacy:
+            extra["matches_legacy"] = all(
+                guiABLE._photoRows(skin.drawBar(brushes[pair:pair+2], width, height, False)) ==
+                guiABLE._photoRows(_LegacySkin([], []).drawBar(brushes[pair:pair+2], width, height, False))
+                for pair in range(0, 8, 2))
+
+        def run(repeat=3):
+            for n in range(repeat):
+                for pair in range(0, 8, 2):
+                    skin.drawBar(brushes[pair:pair+2], width, height, False)
+            return repeat * 4, extra
+        return run
+    return case
+
+
+def paneBuild(rows):
+    def case(root, folder):
+        def run():
+            _pane(root, rows)
+            return rows
+        return run
+    return case
+
+
+def paneInsert(children):
+    def case(root, folder):
+        skin = guiABLE.ScrollSkin(_brushFiles(folder), _brushFiles(folder))
+        pane = guiABLE.ScrollablePane(root, 300, 400, 16, (True, True), (True, True))
+        pane.setSkin(skin)
+        pane.pack()
+        root.update()
+        draws = []
+        draw_to = skin.drawTo
+        skin.drawTo = lambda *args, **kwargs: (draws.append(1), draw_to(*args, **kwargs))
+
+        def run():
+            frames = guiABLE.frame_scheduler.frames
+            for n in range(children):
+                tk.Label(pane.inner, text=f"child {n}", anchor=tk.W).place(x=0, y=n * 20, width=280)
+                pane.inner.place_configure(x=0, y=0, width=280, height=(n + 1) * 20)
+                if n % 50 == 0:
+                    root.update()
+            root.update()
+            return children, {"frames": guiABLE.frame_scheduler.frames - frames, "skin_draws": len(draws)}
+        return run
+    return case
+
+
+def bindSoak(rounds, buttons=50):
+    # Enabling and disabling should cost the same few Tcl calls every time, and leave no Tcl commands behind.
+    def case(root, folder):
+        form = [guiABLE.Toggleable(root, width=40, height=20) for n in range(buttons)]
+        form.append(guiABLE.Holdable(root, width=40, height=20))
+        form.append(guiABLE.Draggable(root, width=40, height=20))
+        for n, widget in enumerate(form):
+            widget.place(x=(n % 10) * 42, y=(n // 10) * 22)
+        form.append(guiABLE.ScrollablePane(root, 200, 200, 16, (True, True), (True, True)))
+        form[-1].place(x=0, y=200)
+        root.update()
+
+        def run():
+            commands = len(root.tk.call("info", "commands"))
+            for n in range(1, rounds + 1):
+                for widget in form:
+                    widget.disable()
+                for widget in form:
+                    widget.enable()
+                if n % 1000 == 0:
+                    root.update()
+            root.update()
+            return rounds * len(form) * 2, {"tcl_commands_added": len(root.tk.call("info", "commands")) - commands}
+        return run
+    return case
+
+
+def repeatHold(hold_ms, load_ms=0):
+    # Holds a Holdable (100ms repeat after 400ms) while the Tk thread is hogged for load_ms of every 50ms.
+    # ops is how many times it fired; with the ticks it skipped that should make 'expected'.
+    def case(root, folder):
+        button = guiABLE.Holdable(root, delay=100, init_delay=400, width=20, height=20)
+        button.pack()
+        root.update()
+
+        def run():
+            calls = []
+            button.function = lambda: calls.append(time.perf_counter())
+            skipped = guiABLE.repeat_scheduler.skipped
+
+            def burn():
+                end = time.perf_counter() + load_ms / 1000
+                while time.perf_counter() < end:
+                    pass
+                root.after(50, burn)
+
+            if load_ms:
+                root.after(50, burn)
+            start = time.perf_counter()
+            button.clicked(None)
+            root.after(hold_ms, button.mouseUp, None)
+            root.after(hold_ms + 300, root.quit)
+            root.mainloop()
+            ticks = [(t - start) * 1000 for t in calls[1:]]
+            ideal = [button.init_delay + n * button.delay for n in range(len(ticks))]
+            return len(calls), {"expected": 1 + (hold_ms - button.init_delay) // button.delay + 1,
+                                "skipped": guiABLE.repeat_scheduler.skipped - skipped,
+                                "max_drift_ms": max((abs(a - b) for a, b in zip(ticks, ideal)), default=0.0)}
+        return run
+    return case
+
+
+def repeatRepress(hold_ms=950):
+    # Press, release, press again and hold: the first press's repeat must not survive as a second loop.
+    def case(root, folder):
+        button = guiABLE.Holdable(root, delay=100, init_delay=400, width=20, height=20)
+        button.pack()
+        root.update()
+
+        def run():
+            calls = []
+            button.function = lambda: calls.append(1)
+            button.clicked(None)
+            button.mouseUp(None)
+            button.clicked(None)
+            root.after(hold_ms, button.mouseUp, None)
+            root.after(hold_ms + 100, root.quit)
+            root.mainloop()
+            single = 2 + (hold_ms - button.init_delay) // button.delay + 1
+            return len(calls), {"double_loop": len(calls) != single}
+        return run
+    return case
+
+
+def holdCallback(policy, busy, hold_ms=1000, work_ms=50):
+    # A held button whose function takes work_ms, repeating every 20ms. ops is how many times the function ran;
+    # max_stall_ms is the longest the event loop went without servicing a 5ms heartbeat.
+    def case(root, folder):
+        calls = []
+
+        def work():
+            time.sleep(work_ms / 1000)
+            calls.append(1)
+
+        button = guiABLE.Holdable(root, work, delay=20, init_delay=20, policy=policy, busy=busy, width=40, height=20)
+        button.pack()
+        root.update()
+
+        def run():
+            beats = [time.perf_counter()]
+
+            def heartbeat():
+                beats.append(time.perf_counter())
+                root.after(5, heartbeat)
+
+            root.after(5, heartbeat)
+            button.clicked(None)
+            root.after(hold_ms, button.mouseUp, None)
+            end = time.perf_counter() + (hold_ms + 500) / 1000
+            while time.perf_counter() < end:
+                root.update()
+            return len(calls), {"max_stall_ms": max(b - a for a, b in zip(beats, beats[1:])) * 1000}
+        return run
+    return case
+
+
+def wheel(ticks):
+    def case(root, folder):
+        pane = _pane(root)
+        x, y = pane.winfo_rootx() + 50, pane.winfo_rooty() + 50
+
+        def run():
+            for n in range(ticks):
+                guiABLE.wheel_router.route(x, y, -120 if (n // 50) % 2 == 0 else 120)
+                if n % 10 == 0:
+                    root.update()
+            root.update()
+            return ticks
+        return run
+    return case
+
+
+def drag(moves):
+    def case(root, folder):
+        pane = _pane(root)
+        handle = pane.v_scroll.handle
+        handle.clicked(SimpleNamespace(x=5, y=5))
+
+        def run():
+            for n in range(moves):
+                handle.mouseDrag(SimpleNamespace(x=5, y=5 + (n % 40) - 20))
+                if n % 5 == 0:
+                    root.update()
+            handle.mouseUp(None)
+            root.update()
+            return moves
+        return run
+    return case
+
+
+def hoverStorm(widgets, rounds):
+    def case(root, folder):
+        paths = _buttonFiles(folder)
+        buttons = [guiABLE.Pushable(root, image_paths=paths, width=40, height=20) for n in range(widgets)]
+        for n, button in enumerate(buttons):
+            button.place(x=(n % 20) * 42, y=(n // 20) * 22)
+        root.update()
+
+        def run():
+            for n in range(rounds):
+                for button in buttons:
+                    button.event_generate("<Enter>")
+                    button.event_generate("<Leave>")
+            root.update()
+            return widgets * rounds * 2
+        return run
+    return case
+
+
+def stateSoak(events):
+    # Enter/click/release/leave cycles straight through one Pushable's handlers. It should keep one canvas item.
+    def case(root, folder):
+        button = guiABLE.Pushable(root, image_paths=_buttonFiles(folder), width=40, height=20)
+        button.pack()
+        root.update()
+        steps = (button.mouseIn, button.clicked, button.mouseUp, button.mouseOut)
+
+        def run():
+            for n in range(events):
+                steps[n % 4](None)
+            root.update_idletasks()
+            return events, {"canvas_items": len(button.find_all())}
+        return run
+    return case
+
+
+def itemHoverStorm(widgets, rounds):
+    def case(root, folder):
+        paths = _buttonFiles(folder)
+        host = guiABLE.ItemHost(root, width=20 * 42, height=(widgets // 20 + 1) * 22)
+        host.pack()
+        for n in range(widgets):
+            guiABLE.PushItem(host, image_paths=paths, width=40, height=20).place(x=(n % 20) * 42, y=(n // 20) * 22)
+        root.update()
+
+        def run():
+            for n in range(rounds):
+                for m in range(widgets):
+                    host.event_generate("<Motion>", x=(m % 20) * 42 + 20, y=(m // 20) * 22 + 10)
+                    host.event_generate("<Motion>", x=(m % 20) * 42 + 41, y=(m // 20) * 22 + 10)
+            root.update()
+            return widgets * rounds * 2
+        return run
+    return case
+
+
+CASES = {
+    "construct_pushable_500": construct(guiABLE.Pushable, 500),
+    "construct_toggleable_500": construct(guiABLE.Toggleable, 500),
+    "construct_toggleable_batch_500": constructBatch(500),
+    "construct_pushitem_10000": constructItems(10000),
+    "rescale_500": rescale(500),
+    "skin_load_loose_1024": skinLoad(1024, atlas=False),
+    "skin_load_atlas_1024": skinLoad(1024, atlas=True),
+    "bundle_open_10_of_1000": bundleOpen(10, 1000),
+    "skin_draw_100": skinDraw(100),
+    "skin_draw_600": skinDraw(600),
+    "skin_draw_1200": skinDraw(1200),
+    "compose_bar_16x600": composeBar(16, 600),
+    "compose_bar_32x1200": composeBar(32, 1200),
+    "compose_bar_legacy_16x600": composeBar(16, 600, legacy=True),
+    "pane_build_2000_rows": paneBuild(2000),
+    "pane_insert_1000_children": paneInsert(1000),
+    "bind_soak_5000_rounds": bindSoak(5000),
+    "wheel_2000_ticks": wheel(2000),
+    "drag_2000_moves": drag(2000),
+    "hover_storm_200x20": hoverStorm(200, 20),
+    "state_soak_100000_events": stateSoak(100000),
+    "trough_storm_5000": troughStorm(5000),
+    "item_hover_storm_200x20": itemHoverStorm(200, 20),
+    "repeat_hold_2050ms": repeatHold(2050),
+    "repeat_hold_2050ms_loaded": repeatHold(2050, load_ms=20),
+    "repeat_repress": repeatRepress(),
+    "hold_inline_run": holdCallback("inline", "run"),
+    "hold_thread_run": holdCallback("thread", "run"),
+    "hold_thread_drop": holdCallback("thread", "drop"),
+    "hold_thread_coalesce": holdCallback("thread", "coalesce"),
+    "hold_asyncio_drop": holdCallback("asyncio", "drop"),
+}
+
+
+def _peakRssKb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak   # macOS reports bytes, Linux kilobytes.
+
+
+def runCase(name):
+    root = tk.Tk()
+    root.geometry("1100x900+0+0")
+    counter = root.tk = guiABLE.CountingTk(root.tk)  # Shared by every widget and image made after this.
+    with tempfile.TemporaryDirectory() as folder:
+        run = CASES[name](root, folder)
+        calls, start = counter.calls, time.perf_counter()
+        ops = run()
+        wall = time.perf_counter() - start
+        calls = counter.calls - calls
+    root.destroy()
+    ops, extra = ops if isinstance(ops, tuple) else (ops, {})   # A case may return (ops, {its own metrics}).
+    return {"wall_s": wall, "tcl_calls": calls, "peak_rss_kb": _peakRssKb(), "ops": ops,
+            "ops_per_s": ops / wall if wall else None, **extra}
+
+
+def _startXvfb():
+    if os.environ.get("DISPLAY") or sys.platform in ("win32", "darwin"):
+        return None
+    if shutil.which("Xvfb") is None:
+        sys.exit("guiABLE benchmarks: no $DISPLAY and no Xvfb to start one.")
+    display = f":{90 + os.getpid() % 500}"
+    xvfb = subprocess.Popen(["Xvfb", display, "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.environ["DISPLAY"] = display
+    time.sleep(.5)
+    return xvfb
+
+
+def runAll(names):
+    xvfb = _startXvfb()
+    results = {}
+    try:
+        for name in names:
+            out = subprocess.run([sys.executable, os.path.abspath(__file__), "--case", name],
+                                 capture_output=True, text=True)
+            if out.returncode:
+                results[name] = {"error": out.stderr.strip().splitlines()[-1:]}
+            else:
+                results[name] = json.loads(out.stdout.strip().splitlines()[-1])
+            print(f"{name:<28} " + (" ".join(f"{k}={v:.4g}" if isinstance(v, float) else f"{k}={v}"
+                                              for k, v in results[name].items())), file=sys.stderr)
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+    return {"meta": {"python": platform.python_version(), "tk": tk.TkVersion, "platform": platform.platform(),
+                     "time": time.strftime("%Y-%m-%dT%H:%M:%S")}, "cases": results}
+
+
+def compare(old_path, new_path, threshold):
+    with open(old_path) as old_file, open(new_path) as new_file:
+        old, new = json.load(old_file)["cases"], json.load(new_file)["cases"]
+    regressions = 0
+    print(f"{'case':<28} {'wall':>8} {'tcl calls':>10} {'peak rss':>9}")
+    for name in sorted(set(old) & set(new)):
+        ratios = []
+        for metric in ("wall_s", "tcl_calls", "peak_rss_kb"):
+            before, after = old[name].get(metric), new[name].get(metric)
+            ratios.append(after / before if before and after is not None else None)
+        flagged = any(r is not None and r > 1 + threshold for r in ratios)
+        regressions += flagged
+        print(f"{name:<28} " + " ".join(f"{r:>8.2f}x" if r is not None else f"{'-':>9}" for r in ratios) +
+              ("  REGRESSION" if flagged else ""))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="guiABLE benchmark suite")
+    parser.add_argument("cases", nargs="*", help=f"cases to run (default all): {', '.join(CASES)}")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two result files")
+    parser.add_argument("--threshold", type=float, default=.1, help="slowdown ratio flagged as regression")
+    parser.add_argument("--case", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.case:
+        print(json.dumps(runCase(args.case)))
+        return 0
+    if args.compare:
+        return 1 if compare(*args.compare, args.threshold) else 0
+    unknown = [name for name in args.cases if name not in CASES]
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(unknown)}")
+    results = runAll(args.cases or list(CASES))
+    if args.json:
+        with open(args.json, "w") as out:
+            json.dump(results, out, indent=1)
+    else:
+        print(json.dumps(results, indent=1))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,19 @@
+import asyncio
+import inspect
+import json
+import os
+import sys
+import tempfile
+import threading
 import tkinter as tk
+from bisect import bisect_right, insort
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from fractions import Fraction
+from functools import wraps
+from queue import Empty, SimpleQueue
+from time import perf_counter
 from warnings import warn
 
 
@@ -10,25 +25,893 @@ def _limitMove(start, size, low_bound, high_bound):
     return start
 
 
+# Pointer position plus root x/y, width and height of every widget asked about, in a single Tcl evaluation.
+# Widget geometry is cached on the Tcl side for one turn of the event loop: the first entry schedules an idle
+# callback that clears it, which nothing the app binds can get in the way of. Any <Configure> or <Destroy> in
+# the application clears it sooner.
+_GEOMETRY_TCL = """
+namespace eval ::guiABLE {
+    variable geometry
+    proc pointer {args} {
+        variable geometry
+        set out [winfo pointerxy .]
+        foreach w $args {
+            if {![info exists geometry($w)]} {
+                if {![array size geometry]} {
+                    after idle {array unset ::guiABLE::geometry}
+                }
+                set geometry($w) [list [winfo rootx $w] [winfo rooty $w] [winfo width $w] [winfo height $w]]
+            }
+            lappend out {*}$geometry($w)
+        }
+        return $out
+    }
+}
+bind all <Configure> {+array unset ::guiABLE::geometry}
+bind all <Destroy> {+array unset ::guiABLE::geometry}
+"""
+
+
+def _getLocalMice(widgets):
+    tk_app, paths = widgets[0].tk, [str(widget) for widget in widgets]
+    try:
+        values = tk_app.call("::guiABLE::pointer", *paths)
+    except tk.TclError as e:
+        if "::guiABLE::pointer" not in str(e):
+            raise
+        tk_app.eval(_GEOMETRY_TCL)
+        values = tk_app.call("::guiABLE::pointer", *paths)
+    values = [int(n) for n in tk_app.splitlist(values)]
+    pointer_x, pointer_y = values[0], values[1]
+    mice = []
+    for n in range(2, len(values), 4):
+        root_x, root_y, width, height = values[n:n+4]
+        x, y = pointer_x - root_x, pointer_y - root_y
+        mice.append((x, y, 0 <= x <= width and 0 <= y <= height))
+    return mice
+
+
 def _getLocalMouse(widget):
-    x = widget.winfo_pointerx() - widget.winfo_rootx()
-    y = widget.winfo_pointery() - widget.winfo_rooty()
-    if x < 0 or x > widget.winfo_width():
-        return x, y, False
-    if y < 0 or y > widget.winfo_height():
-        return x, y, False
-    return x, y, True   # Returns local x and y coordinates of mouse, and whether mouse is over widget.
+    return _getLocalMice([widget])[0]   # Returns local x and y coordinates of mouse, and whether mouse is over widget.
 
 
 def updateHover(widget):
-    x, y, mouse_in = _getLocalMouse(widget)
+    if _batches:
+        _batches[-1].hover[str(widget)] = widget
+        return
+    if hasattr(widget, "_host"):    # An ItemHost item: its host already knows what the pointer is over.
+        mouse_in = widget._host._hovered is widget
+    else:
+        x, y, mouse_in = _getLocalMouse(widget)
     widget.mouseIn(None) if mouse_in else widget.mouseOut(None)
 
 
+def updateHovers(widgets):
+    widgets = list(widgets)
+    if _batches:
+        _batches[-1].hover.update((str(widget), widget) for widget in widgets)
+        return
+    windows = [widget for widget in widgets if not hasattr(widget, "_host")]
+    if windows:
+        for widget, (x, y, mouse_in) in zip(windows, _getLocalMice(windows)):
+            widget.mouseIn(None) if mouse_in else widget.mouseOut(None)
+    for widget in widgets:
+        if hasattr(widget, "_host"):
+            widget.mouseIn(None) if widget._host._hovered is widget else widget.mouseOut(None)
+
+
+# Every guiABLE widget shares one set of class bindings through the "guiABLE" bindtag, made once per root, instead
+# of binding (and leaking a Tcl command for) each handler on each instance every time it's enabled. The tag looks
+# the event's widget up in _tag_targets and calls the handlers of whichever targets are enabled, so enable() and
+# disable() are just a flag.
+_BINDTAG = "guiABLE"
+_TAG_HANDLERS = {"<Enter>": "mouseIn", "<Leave>": "mouseOut", "<Button-1>": "clicked",
+                 "<ButtonRelease-1>": "mouseUp", "<B1-Motion>": "mouseDrag"}
+_tagged_roots = set()
+_tag_targets = {}   # widget path : [(target, handler names or None for all)]
+_STALE_TCL = "if {[info exists ::guiABLE_stale(%%W)]} {%s %%W}"    # Only widgets setScale() skipped call back.
+_batches = []
+
+
+class _Batch:
+    def __init__(self):
+        self.widgets = []
+        self.hover = {}     # widget path : widget, hover states to resolve together when the batch ends
+
+
+def _tagDispatcher(name):
+    def dispatch(event):
+        for target, names in _tag_targets.get(str(event.widget), ()):
+            handler = getattr(target, name, None)
+            if handler is not None and target.enabled and (names is None or name in names):
+                handler(event)
+    return dispatch
+
+
+def _attachTag(widget, target=None, names=None):
+    if hasattr(widget, "_host"):
+        return      # An ItemHost item; its host delivers its events.
+    root = widget._root()
+    if root not in _tagged_roots:
+        _tagged_roots.add(root)
+        for sequence, name in _TAG_HANDLERS.items():
+            root.bind_class(_BINDTAG, sequence, _tagDispatcher(name))
+        root.bind_class(_BINDTAG, "<Visibility>", _STALE_TCL % root.register(_rescaleStale))
+    targets = _tag_targets.setdefault(str(widget), [])
+    if not targets:
+        tags = widget.bindtags()
+        widget.bindtags(tags[:1] + (_BINDTAG,) + tags[1:])
+    if all(entry[0] is not (target or widget) for entry in targets):
+        targets.append((target or widget, names))
+
+
+def _detachTag(widget):
+    _tag_targets.pop(str(widget), None)
+
+
+def _rescaleTargets(path):
+    for target, names in _tag_targets.get(path, ()):
+        if names is None and hasattr(target, "rescale"):  # Restricted entries borrow a window; the owner rescales.
+            target.rescale()
+
+
+def _rescaleStale(path):
+    targets = _tag_targets.get(path)
+    if targets:
+        targets[0][0].tk.call("unset", "-nocomplain", f"::guiABLE_stale({path})")
+        _rescaleTargets(path)
+
+
+def setScale(scale):
+    # Every guiABLE image is drawn at this scale from now on. Widgets on screen rebuild their images now; the rest
+    # are marked stale and rebuild when they next become visible. Widget sizes stay the caller's business.
+    image_cache.scale = _ratio(scale)
+    by_root = {}
+    for path, targets in _tag_targets.items():
+        by_root.setdefault(targets[0][0]._root(), []).append(path)
+    for root, paths in by_root.items():
+        shown = root.tk.splitlist(root.tk.call("lmap", "w", paths, "expr {[winfo exists $w] && [winfo viewable $w]}"))
+        root.tk.call("array", "unset", "::guiABLE_stale")
+        stale = [path for path, viewable in zip(paths, shown) if not int(viewable)]
+        if stale:
+            root.tk.call("array", "set", "::guiABLE_stale", [item for path in stale for item in (path, 1)])
+        for path, viewable in zip(paths, shown):
+            if int(viewable):
+                _rescaleTargets(path)
+
+
+@contextmanager
+def building():
+    # Widgets made inside skip their per-widget enable() and hover checks; on the way out they're enabled
+    # together, and every pending hover state is resolved in a single pointer query.
+    batch = _Batch()
+    _batches.append(batch)
+    try:
+        yield batch.widgets
+    finally:
+        _batches.pop()
+        if _batches:
+            _batches[-1].widgets.extend(batch.widgets)
+            _batches[-1].hover.update(batch.hover)
+        else:
+            _batches.append(batch)
+            try:
+                for widget in batch.widgets:
+                    if widget._enable_pending and _alive(widget):   # Not if disabled or destroyed in the block.
+                        widget._enable_pending = False
+                        widget.enable()
+            finally:
+                _batches.pop()
+            updateHovers(widget for widget in batch.hover.values() if _alive(widget) and widget.enabled)
+
+
+def _alive(widget):
+    return widget.master is None or widget.master.children.get(widget._name) is widget
+
+
+def buildMany(factory, count):
+    with building():
+        return [factory(n) for n in range(count)]
+
+
+def _photoRows(image):
+    # One Tcl round trip for the whole image: a list of rows of "#rrggbb" strings.
+    return [image.tk.splitlist(row) for row in image.tk.splitlist(image.tk.call(image.name, "data"))]
+
+
+def _rowsData(rows):
+    return " ".join("{" + " ".join(row) + "}" for row in rows)
+
+
+def _isAtlasRegion(path):
+    return "#" in path and path.rpartition("#")[0].lower().endswith((".json", ".skin"))
+
+
+def _readAtlas(index_path):
+    # An atlas is a JSON index, {"image": "sheet.png", "regions": {name: [x, y, width, height], ...}},
+    # naming regions of one packed image. A region is addressed like a file: "skins/ui.json#button/normal".
+    try:
+        with open(index_path) as index_file:
+            index = json.load(index_file)
+    except (OSError, ValueError) as e:
+        raise tk.TclError(f"couldn't read atlas \"{index_path}\": {e}")
+    return os.path.normpath(os.path.join(os.path.dirname(index_path), index["image"])), index["regions"]
+
+
+def atlasPaths(index_path, *names):
+    return [f"{index_path}#{name}" if name is not None else None for name in names]
+
+
+def packAtlas(image_paths, index_path, names=None, max_width=1024, padding=1):
+    images = [tk.PhotoImage(file=path) for path in image_paths]
+    if names is None:
+        common = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in image_paths])
+        names = [os.path.splitext(os.path.relpath(os.path.abspath(path), common))[0].replace(os.sep, "/")
+                 for path in image_paths]
+
+    regions, x, y, shelf, sheet_width = {}, 0, 0, 0, 1
+    for n in sorted(range(len(images)), key=lambda n: -images[n].height()):    # Shelf packing, tallest first.
+        width, height = images[n].width(), images[n].height()
+        if x and x + width > max_width:
+            x, y, shelf = 0, y + shelf + padding, 0
+        regions[names[n]] = [x, y, width, height]
+        x, shelf, sheet_width = x + width + padding, max(shelf, height), max(sheet_width, x + width)
+
+    sheet = tk.PhotoImage(width=sheet_width, height=max(1, y + shelf))
+    for image, name in zip(images, names):
+        sheet.tk.call(sheet.name, "copy", image.name, "-to", regions[name][0], regions[name][1])
+    sheet_path = os.path.splitext(index_path)[0] + ".png"
+    sheet.write(sheet_path, format="png")
+    with open(index_path, "w") as index_file:
+        json.dump({"image": os.path.basename(sheet_path), "regions": regions}, index_file, indent=1, sort_keys=True)
+    return regions
+
+
+_SKIN_MAGIC = b"guiABLE skin 1\n"
+
+
+def _readSkin(skin_path):
+    # A compiled skin is one file: a magic line, a one-line JSON manifest, then every image's PNG bytes back to back.
+    # The manifest's "images" gives each one's [offset, length] past the manifest, so one can be read on its own.
+    try:
+        with open(skin_path, "rb") as skin_file:
+            if skin_file.readline() != _SKIN_MAGIC:
+                raise ValueError("not a compiled guiABLE skin")
+            manifest = json.loads(skin_file.readline())
+            manifest["base"] = skin_file.tell()
+    except (OSError, ValueError) as e:
+        raise tk.TclError(f"couldn't read skin \"{skin_path}\": {e}")
+    return manifest
+
+
+def compileSkin(theme, skin_path):
+    # Renders a theme ahead of time into one compiled skin file, scroll bars composed at the sizes it lists, so an app
+    # opening it (see SkinBundle) decodes only what it shows. 'theme' is a dict or a JSON file (whose paths are then
+    # relative to it) of {"backgrounds": {name: path}, "buttons": {name: [paths]}, "toggles": {name: [[paths],
+    # [paths]]}, "scrollbars": {name: {"trough": [paths], "handle": [paths], "sizes": [[width, height], ...]}}}.
+    folder = ""
+    if isinstance(theme, str):
+        folder = os.path.dirname(theme)
+        with open(theme) as theme_file:
+            theme = json.load(theme_file)
+    manifest = {"images": {}, "backgrounds": {}, "buttons": {}, "toggles": {}, "scrollbars": {}}
+    blobs, stored, offset = [], {}, 0   # stored: source path : [offset, length], so shared images are kept once
+
+    with tempfile.TemporaryDirectory() as temp:
+        def store(name, path=None, image=None):
+            nonlocal offset
+            if path is not None:
+                path = os.path.join(folder, path)
+                if path in stored:
+                    manifest["images"][name] = stored[path]
+                    return name
+                image = image_cache.get(path, scale=1)
+                image_cache.release(image)
+            image.write(os.path.join(temp, "image.png"), format="png")
+            with open(os.path.join(temp, "image.png"), "rb") as image_file:
+                blobs.append(image_file.read())
+            manifest["images"][name] = [offset, len(blobs[-1])]
+            offset += len(blobs[-1])
+            if path is not None:
+                stored[path] = manifest["images"][name]
+            return name
+
+        for name, path in theme.get("backgrounds", {}).items():
+            manifest["backgrounds"][name] = store(f"backgrounds/{name}", path)
+        for name, paths in theme.get("buttons", {}).items():
+            manifest["buttons"][name] = [store(f"buttons/{name}/{n}", path) for n, path in enumerate(paths)]
+        for name, sets in theme.get("toggles", {}).items():
+            manifest["toggles"][name] = [[store(f"toggles/{name}/{s + 1}/{n}", path) for n, path in enumerate(paths)]
+                                         for s, paths in enumerate(sets)]
+        for name, bar in theme.get("scrollbars", {}).items():
+            skin = ScrollSkin(list(bar["trough"]), list(bar["handle"]), cache_size=0)
+            entry = manifest["scrollbars"][name] = {"bars": []}
+            for part, paths in (("trough", skin._trough_paths), ("handle", skin._handle_paths)):
+                entry[part] = [store(f"scrollbars/{name}/{part}/{n}", path) for n, path in enumerate(paths)]
+                brushes = [image_cache.get(os.path.join(folder, path), scale=1) for path in paths]
+                for width, height in bar.get("sizes", ()):
+                    for pair in range(0, len(paths), 2):
+                        composed = skin.drawBar(brushes[pair:pair+2], width, height, False)
+                        entry["bars"].append([part, pair, width, height, store(
+                            f"scrollbars/{name}/{part}/{pair}/{width}x{height}", image=composed)])
+                for brush in brushes:
+                    image_cache.release(brush)
+
+    with open(skin_path, "wb") as skin_file:
+        skin_file.write(_SKIN_MAGIC)
+        skin_file.write(json.dumps(manifest, sort_keys=True).encode() + b"\n")
+        for blob in blobs:
+            skin_file.write(blob)
+    return manifest
+
+
+def _transformImage(image, mirror_x=False, mirror_y=False, rotate=False, scale=1):
+    if rotate:  # 'rotate' swaps the x and y axes, the same way ScrollSkin lays a vertical brush on its side.
+        rows = list(zip(*_photoRows(image)))
+        image = tk.PhotoImage(width=image.height(), height=image.width())
+        image.put(_rowsData(rows))
+    if mirror_x or mirror_y:
+        out = tk.PhotoImage()
+        out.tk.call(out.name, "copy", image.name, "-subsample", -1 if mirror_x else 1, -1 if mirror_y else 1)
+        image = out
+    scale = _ratio(scale)
+    return image if scale == 1 else _scaleImage(image, scale)
+
+
+def _ratio(scale):
+    return Fraction(scale).limit_denominator(1000)
+
+
+def _scaleRuns(size, scale):
+    # Nearest-neighbour source pixel for each output pixel, as (source, first, last + 1) runs of output pixels.
+    runs = []
+    for out in range(max(1, round(size * scale))):
+        source = min(size - 1, int((out + .5) / scale))
+        if runs and runs[-1][0] == source:
+            runs[-1][2] = out + 1
+        else:
+            runs.append([source, out, out + 1])
+    return runs
+
+
+def _scaleImage(image, scale):
+    # Small ratios (2, 3/2, 1/2, 3/4...) are Tk's own zoom and subsample. Anything else is resampled nearest-
+    # neighbour by copying each source column, then row, across its run of output pixels (copy tiles the source
+    # over the target box), all in one Tcl evaluation. Copying keeps transparency, which reading pixels wouldn't.
+    if scale.numerator <= 4 and scale.denominator <= 4:
+        image = image.zoom(scale.numerator) if scale.numerator > 1 else image
+        return image.subsample(scale.denominator) if scale.denominator > 1 else image
+    width, height = image.width(), image.height()
+    columns, rows = _scaleRuns(width, scale), _scaleRuns(height, scale)
+    out_width = columns[-1][2]
+    wide = tk.PhotoImage(width=out_width, height=height)
+    out = tk.PhotoImage(width=out_width, height=rows[-1][2])
+    script = [f"{wide.name} copy {image.name} -from {x} 0 {x + 1} {height} -to {first} 0 {last} {height}"
+              for x, first, last in columns]
+    script += [f"{out.name} copy {wide.name} -from 0 {y} {out_width} {y + 1} -to 0 {first} {out_width} {last}"
+               for y, first, last in rows]
+    image.tk.eval("\n".join(script))
+    return out
+
+
+class ImageCache:
+    def __init__(self, max_unused=64, workers=4):
+        self.max_unused = max_unused
+        self.workers = workers
+        self.async_loading = False      # Read files on worker threads; get() hands back a placeholder meanwhile.
+        self.scale = Fraction(1)        # What get() scales to when not told. Change it with setScale().
+        self.batch_ms = 8               # Longest the Tk thread spends applying finished images per poll.
+        self.poll_ms = 10
+        self.hits = 0
+        self.misses = 0
+        self.requested = 0
+        self.loaded = 0
+        self._images = {}               # (path, mirror_x, mirror_y, rotate, scale) : PhotoImage
+        self._refs = {}
+        self._keys = {}                 # Tk image name : key
+        self._unused = OrderedDict()    # Keys with no references left, oldest first.
+        self._pinned = []
+        self._atlases = {}              # index path : (sheet path, regions, sheet PhotoImage)
+        self._skins = {}                # compiled skin path : manifest
+        self._skin_files = set()        # Skins opened by SkinBundle, found by path whatever they're named
+        self._loading = {}              # Tk image name : placeholder still waiting for its pixels
+        self._dependents = {}           # Tk image name : [(placeholder, make)] to derive once it arrives
+        self._waiters = []              # [names still loading, callback]
+        self._arrived = SimpleQueue()   # (image name, path, bytes or OSError) from the worker threads
+        self._pool = None
+        self._after = None
+        self._root = None               # The root whose interpreter holds all of the above.
+
+    def _checkRoot(self):
+        # PhotoImages belong to one interpreter. Once the app's root is destroyed and a new one made, start over
+        # instead of handing out images that no longer exist.
+        if tk._default_root is not self._root:
+            self._root = tk._default_root
+            self._images.clear()
+            self._refs.clear()
+            self._keys.clear()
+            self._unused.clear()
+            self._pinned = []
+            self._atlases.clear()
+            self._loading.clear()
+            self._dependents.clear()
+            self._waiters = []
+            self._after = None
+
+    def get(self, path, mirror_x=False, mirror_y=False, rotate=False, scale=None):
+        self._checkRoot()
+        file_path, separator, region = path.rpartition("#") if self._isRegion(path) else (path, "", "")
+        key = (os.path.normpath(file_path) + separator + region,
+               bool(mirror_x), bool(mirror_y), bool(rotate), _ratio(self.scale if scale is None else scale))
+        image = self._images.get(key)
+        if image is None:
+            self.misses += 1
+            image = self._load(key)
+        else:
+            self.hits += 1
+        self._unused.pop(key, None)
+        self._refs[key] += 1
+        self._trim()
+        return image
+
+    def _load(self, key):
+        path, transform = key[0], key[1:]
+        if any(transform[:3]) or transform[3] != 1:
+            image = self._derive((path, False, False, False, Fraction(1)),
+                                 lambda base: _transformImage(base, *transform))
+        elif self._isRegion(path):
+            image = self._slice(path)
+        elif self.async_loading:
+            image = self._loadLater(path)
+        else:
+            image = tk.PhotoImage(file=path)
+        self._images[key] = image
+        self._keys[image.name] = key
+        self._refs[key] = 0
+        self._unused[key] = True    # Unused until handed out, so a transform's base stays evictable.
+        return image
+
+    def _derive(self, source_key, make):
+        source = self._images.get(source_key)
+        if source is None:
+            source = self._load(source_key)
+        if source.name not in self._loading:
+            return make(source)
+        image = tk.PhotoImage()
+        self._loading[image.name] = image
+        self._dependents.setdefault(source.name, []).append((image, make))
+        return image
+
+    def _isRegion(self, path):
+        return _isAtlasRegion(path) or os.path.normpath(path.rpartition("#")[0]) in self._skin_files
+
+    def openSkin(self, skin_path):
+        # Reads a compiled skin's manifest, and takes "<skin_path>#<image>" from then on even without a .skin name.
+        skin_path = os.path.normpath(skin_path)
+        self._skins[skin_path] = _readSkin(skin_path)
+        self._skin_files.add(skin_path)
+        return self._skins[skin_path]
+
+    def _slice(self, path):
+        index_path, name = path.rsplit("#", 1)
+        if index_path.lower().endswith(".skin") or index_path in self._skin_files:
+            return self._unpack(index_path, name)
+        if index_path not in self._atlases:
+            sheet_path, regions = _readAtlas(index_path)
+            self._atlases[index_path] = (sheet_path, regions, self.get(sheet_path, scale=1))
+        sheet_path, regions, sheet = self._atlases[index_path]
+        if name not in regions:
+            raise tk.TclError(f"atlas \"{index_path}\" has no region \"{name}\"")
+        x, y, width, height = regions[name]
+
+        def cut(sheet):
+            image = tk.PhotoImage(width=width, height=height)
+            image.tk.call(image.name, "copy", sheet.name, "-from", x, y, x + width, y + height)
+            return image
+        return self._derive((sheet_path, False, False, False, Fraction(1)), cut)
+
+    def _unpack(self, skin_path, name):
+        if skin_path not in self._skins:
+            self._skins[skin_path] = _readSkin(skin_path)
+        manifest = self._skins[skin_path]
+        if name not in manifest["images"]:
+            raise tk.TclError(f"skin \"{skin_path}\" has no image \"{name}\"")
+        offset, length = manifest["images"][name]
+        if self.async_loading:
+            return self._loadLater(skin_path, manifest["base"] + offset, length)
+        try:
+            with open(skin_path, "rb") as skin_file:
+                skin_file.seek(manifest["base"] + offset)
+                return tk.PhotoImage(data=skin_file.read(length))
+        except OSError as e:
+            raise tk.TclError(f"couldn't read skin \"{skin_path}\": {e}")
+
+    def _loadLater(self, path, offset=0, length=-1):
+        image = tk.PhotoImage()
+        self._loading[image.name] = image
+        self.requested += 1
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="guiABLE-images")
+        self._pool.submit(self._read, image.name, path, offset, length)
+        self._poll()
+        return image
+
+    def _read(self, name, path, offset=0, length=-1):
+        # Worker thread: file I/O only. Tcl interpreters are bound to their thread, so Tk decodes on the way in.
+        try:
+            with open(path, "rb") as image_file:
+                image_file.seek(offset)
+                self._arrived.put((name, path, image_file.read(length)))
+        except OSError as e:
+            self._arrived.put((name, path, e))
+
+    def _poll(self):
+        if self._after is None and self._loading:
+            self._after = tk._default_root.after(self.poll_ms, self._drain)
+
+    def _drain(self):
+        self._after = None
+        deadline = perf_counter() + self.batch_ms / 1000
+        while perf_counter() < deadline:
+            try:
+                name, path, data = self._arrived.get_nowait()
+            except Empty:
+                break
+            if name not in self._loading:   # Read for a root that has since been destroyed.
+                continue
+            if isinstance(data, OSError):
+                warn(f"guiABLE: Image not found: {path}", RuntimeWarning)
+            else:
+                try:
+                    self._loading[name].configure(data=data)   # Widgets already showing the placeholder update.
+                except tk.TclError:
+                    warn(f"guiABLE: Image could not be decoded: {path}", RuntimeWarning)
+            self.loaded += 1
+            self._finish(name)
+        self._poll()
+
+    def _finish(self, name):
+        image = self._loading.pop(name)
+        for placeholder, make in self._dependents.pop(name, ()):
+            try:
+                placeholder.tk.call(placeholder.name, "copy", make(image).name)
+            except tk.TclError as e:
+                warn(f"guiABLE: Image could not be derived: {e}", RuntimeWarning)
+            self._finish(placeholder.name)
+        for waiter in self._waiters:
+            waiter[0].discard(name)
+        ready = [callback for names, callback in self._waiters if not names]
+        self._waiters = [waiter for waiter in self._waiters if waiter[0]]
+        for callback in ready:
+            callback()
+
+    def pending(self, images=None):
+        if images is None:
+            return len(self._loading)
+        return sum(getattr(image, "name", None) in self._loading for image in images)
+
+    def whenReady(self, callback, images=None):
+        if images is None:
+            names = set(self._loading)
+        else:
+            names = {image.name for image in images if getattr(image, "name", None) in self._loading}
+        if names:
+            self._waiters.append([names, callback])
+        else:
+            callback()
+
+    def progress(self):
+        return self.loaded, self.requested
+
+    def rescaled(self, images, scale=None):
+        # The same images at another scale (the cache's own by default), trading each reference for a new one.
+        scale = _ratio(self.scale if scale is None else scale)
+        keys = [self._keys.get(getattr(image, "name", None)) for image in images]
+        out = [image if key is None or key[4] == scale else self.get(*key[:4], scale=scale)
+               for image, key in zip(images, keys)]
+        for image, new in zip(images, out):
+            if new is not image:
+                self.release(image)
+        return out
+
+    def release(self, image):
+        key = self._keys.get(getattr(image, "name", None))
+        if key is None or self._refs[key] == 0:
+            return
+        self._refs[key] -= 1
+        if self._refs[key] == 0:
+            self._unused[key] = True
+            self._trim()
+
+    def _trim(self):
+        while len(self._unused) > self.max_unused:
+            key, _ = self._unused.popitem(last=False)
+            del self._keys[self._images.pop(key).name]
+            del self._refs[key]
+
+    def preload(self, directory, extensions=(".png", ".gif", ".ppm", ".pgm")):
+        for root, dirs, files in os.walk(directory):
+            for name in sorted(files):
+                if name.lower().endswith(extensions):
+                    try:
+                        self._pinned.append(self.get(os.path.join(root, name)))
+                    except tk.TclError:
+                        warn(f"guiABLE: Image could not be preloaded: {os.path.join(root, name)}", RuntimeWarning)
+        return len(self._pinned)
+
+    def unpin(self):
+        pinned, self._pinned = self._pinned, []
+        for image in pinned:
+            self.release(image)
+
+    def clear(self):
+        for sheet_path, regions, sheet in self._atlases.values():
+            self.release(sheet)
+        self._atlases.clear()
+        self._skins.clear()
+        max_unused, self.max_unused = self.max_unused, 0
+        self._trim()
+        self.max_unused = max_unused
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "cached": len(self._images),
+                "unused": len(self._unused), "pinned": len(self._pinned), "loading": len(self._loading)}
+
+
+image_cache = ImageCache()
+
+
+class WheelRouter:
+    def __init__(self):
+        self._panes = {}        # (root, pane path) : Scrollables its wheel events drive
+        self._roots = set()     # Roots whose wheel events are bound
+
+    def register(self, pane, scrollable):
+        root = pane._root()
+        if root not in self._roots:
+            self._roots.add(root)
+            for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+                root.bind_all(sequence, lambda event, root=root: self.wheel(event, root), "+")
+        scrollables = self._panes.setdefault((root, str(pane)), [])
+        if scrollable not in scrollables:
+            scrollables.append(scrollable)
+
+    def unregister(self, scrollable):
+        for key, scrollables in list(self._panes.items()):
+            if scrollable in scrollables:
+                scrollables.remove(scrollable)
+            if not scrollables:
+                del self._panes[key]
+
+    def wheel(self, event, root=None):
+        delta = {4: 120, 5: -120}.get(event.num, event.delta)  # X11 reports the wheel as buttons 4 and 5.
+        self.route(event.x_root, event.y_root, delta, root)
+
+    def route(self, x_root, y_root, delta, root=None):
+        # Deliver to the innermost registered pane under the pointer that has an enabled bar.
+        root = tk._default_root if root is None else root
+        path = str(root.tk.call("winfo", "containing", x_root, y_root))
+        while path:
+            scrollables = [bar for bar in self._panes.get((root, path), ()) if bar.enabled]
+            for scrollable in scrollables:
+                scrollable.scrollBy(delta)
+            if scrollables:
+                return True
+            path = path.rpartition(".")[0]
+        return False
+
+
+wheel_router = WheelRouter()
+
+
+class FrameScheduler:
+    def __init__(self, fps=None):
+        self.fps = fps              # None applies pending work on the next idle; otherwise at most 'fps' frames/sec.
+        self.animation_fps = 60     # Pace of animations (smooth scrolling) when fps is None, so they take real time.
+        self.frames = 0
+        self.coalesced = 0
+        self.frame_time = 0.0
+        self._total_time = 0.0
+        self._last = 0.0
+        self._pending = OrderedDict()   # (widget path, name) : (widget, callback)
+        self._after = None
+        self._after_root = None
+        self._roots = set()             # Roots watched for <Destroy>
+
+    def schedule(self, widget, name, callback, animate=False):
+        # Repeated requests for the same widget and name before the frame runs collapse into the latest one.
+        key = (str(widget), name)
+        if key in self._pending:
+            self.coalesced += 1
+        self._pending[key] = (widget, callback)
+        if self._after is None:
+            root = widget._root()   # Scheduled on the root, so destroying 'widget' can't orphan the callback.
+            fps = self.fps or (self.animation_fps if animate else None)
+            delay = 0 if not fps else round(1000 / fps - (perf_counter() - self._last) * 1000)
+            self._after = root.after(delay, self._run) if delay > 0 else root.after_idle(self._run)
+            self._after_root = root
+            if root not in self._roots:
+                self._roots.add(root)
+                root.bind("<Destroy>", lambda event, root=root: self._forget(event, root), "+")
+
+    def _forget(self, event, root):
+        # A root destroyed with a frame pending takes the frame with it; let the next root schedule its own.
+        if event.widget is root:
+            self._roots.discard(root)
+            self._pending = OrderedDict((key, value) for key, value in self._pending.items()
+                                        if value[0]._root() is not root)
+            if self._after_root is root:
+                self._after = self._after_root = None
+                if self._pending:   # Work for other roots was riding on this one's frame.
+                    widget, callback = next(iter(self._pending.values()))
+                    self._after = widget._root().after_idle(self._run)
+                    self._after_root = widget._root()
+
+    def _run(self):
+        self._after = None
+        self._last = start = perf_counter()     # Frames are paced start to start.
+        pending, self._pending = self._pending, OrderedDict()
+        for widget, callback in pending.values():
+            try:
+                callback()
+            except tk.TclError:
+                if widget.winfo_exists():
+                    raise
+        self.frame_time = perf_counter() - start
+        self._total_time += self.frame_time
+        self.frames += 1
+
+    def stats(self):
+        return {"frames": self.frames, "coalesced": self.coalesced, "frame_time_ms": self.frame_time * 1000,
+                "average_frame_ms": self._total_time * 1000 / self.frames if self.frames else 0.0}
+
+
+frame_scheduler = FrameScheduler()
+
+
+class Repeat:
+    def __init__(self, scheduler, widget, callback, delay, init_delay, acceleration=1.0, min_delay=0):
+        self.scheduler = scheduler
+        self.widget = widget
+        self.callback = callback
+        self.delay = delay
+        self.acceleration = acceleration    # Each repeat's delay is the last one's times this, down to min_delay.
+        self.min_delay = min_delay
+        self.count = 0
+        self.active = True
+        self.deadline = perf_counter() + init_delay / 1000
+
+    def period(self):
+        return max(self.min_delay, self.delay * self.acceleration ** self.count) / 1000
+
+    def cancel(self):
+        self.scheduler.cancel(self.widget, self)
+
+
+class RepeatScheduler:
+    def __init__(self):
+        self.ticks = 0
+        self.skipped = 0
+        self._repeats = {}  # widget path : Repeat; one per widget, so a new press replaces a stale loop.
+        self._after = None
+        self._root = None
+
+    def start(self, widget, callback, delay, init_delay=None, acceleration=1.0, min_delay=0):
+        self.cancel(widget)
+        repeat = Repeat(self, widget, callback, delay, delay if init_delay is None else init_delay,
+                        acceleration, min_delay)
+        self._repeats[str(widget)] = repeat
+        self._arm(widget._root())
+        return repeat
+
+    def cancel(self, widget, repeat=None):
+        key = str(widget)
+        if key in self._repeats and (repeat is None or self._repeats[key] is repeat):
+            self._repeats.pop(key).active = False
+
+    def _arm(self, root):
+        if self._after is not None:
+            self._root.after_cancel(self._after)
+            self._after = None
+        if self._repeats:
+            self._root = root
+            deadline = min(repeat.deadline for repeat in self._repeats.values())
+            self._after = root.after(max(0, round((deadline - perf_counter()) * 1000)), self._fire)
+
+    def _fire(self):
+        self._after = None
+        now = perf_counter()
+        for repeat in [r for r in self._repeats.values() if r.deadline <= now + .0005]:
+            if not repeat.active:   # Cancelled by a callback earlier in this pass.
+                continue
+            repeat.count += 1
+            repeat.deadline += repeat.period()  # Fixed cadence: measured from the schedule, not the callback.
+            while repeat.deadline <= now:       # Fell a whole period behind; drop ticks rather than burst.
+                repeat.deadline += repeat.period()
+                self.skipped += 1
+            self.ticks += 1
+            try:
+                repeat.callback()
+            except Exception as e:  # Stop this repeat only; the others keep their cadence.
+                repeat.cancel()
+                if not (isinstance(e, tk.TclError) and not repeat.widget.winfo_exists()):
+                    self._root.report_callback_exception(type(e), e, e.__traceback__)
+        self._arm(self._root)
+
+    def active(self, widget):
+        return str(widget) in self._repeats
+
+
+repeat_scheduler = RepeatScheduler()
+
+
+class CallbackRunner:
+    # Runs button functions off the Tk thread for Clickables made with policy="thread" (on a pool of 'workers'
+    # threads) or policy="asyncio" (on one event loop in a background thread; coroutine functions are awaited).
+    # What they return or raise comes back through a queue the Tk thread polls while anything is in flight.
+    def __init__(self, workers=4):
+        self.workers = workers
+        self.poll_ms = 10
+        self._pool = None
+        self._loop = None
+        self._done = SimpleQueue()  # (on_done, future) from the worker threads and the event loop
+        self._in_flight = 0
+        self._after = None
+        self._root = None
+
+    def submit(self, widget, function, policy, on_done):
+        if policy == "thread":
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="guiABLE-callbacks")
+            future = self._pool.submit(function)
+        else:
+            future = asyncio.run_coroutine_threadsafe(self._await(function), self._eventLoop())
+        self._in_flight += 1
+        self._root = widget._root()
+        future.add_done_callback(lambda future: self._done.put((on_done, future)))
+        self._poll()
+        return future
+
+    @staticmethod
+    async def _await(function):
+        result = function()
+        return await result if inspect.isawaitable(result) else result
+
+    def _eventLoop(self):
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            threading.Thread(target=self._loop.run_forever, name="guiABLE-asyncio", daemon=True).start()
+        return self._loop
+
+    def _poll(self):
+        if self._after is None and self._in_flight:
+            self._after = self._root.after(self.poll_ms, self._drain)
+
+    def _drain(self):
+        self._after = None
+        try:
+            while True:
+                try:
+                    on_done, future = self._done.get_nowait()
+                except Empty:
+                    break
+                self._in_flight -= 1
+                on_done(future)
+        finally:
+            self._poll()
+
+    def inFlight(self):
+        return self._in_flight
+
+
+callback_runner = CallbackRunner()
+
+
 class Canvasable(tk.Text):
     def __init__(self, parent, **kwargs):
         super().__init__(parent, bd=0, padx=0, pady=0, state=tk.DISABLED, cursor="arrow", **kwargs)
         self.configure(selectbackground=self.cget("bg"))
+        self._image = None
 
     def _configure(self, cmd, cnf, kw):
         if "bg" in kw:
@@ -37,28 +920,72 @@ class Canvasable(tk.Text):
             kw["selectbackground"] = kw["background"]
         super()._configure(cmd, cnf, kw)
 
+    def showImage(self, image):
+        if image is self._image:
+            return
+        self._image = image
+        self.configure(state=tk.NORMAL)
+        self.delete(1.0, tk.END)
+        self.image_create(tk.END, image=image)
+        self.configure(state=tk.DISABLED)
+
+
+class ImageSurface(tk.Canvas):
+    # A cheaper inner surface for Backgroundable, for when nobody needs it to be a Text widget: the image is one
+    # canvas item, re-pointed in place and left alone when it hasn't changed. Children can still be placed on it.
+    # Scrollbar troughs use it; pass surface=ImageSurface to use it anywhere else.
+    def __init__(self, parent, **kwargs):
+        super().__init__(parent, bd=0, highlightthickness=0, **kwargs)
+        self._image_item = None
+        self._image = None
+
+    def showImage(self, image):
+        if self._image_item is not None and image is self._image:
+            return
+        self._image = image
+        if self._image_item is None:
+            self._image_item = self.create_image(0, 0, image=image, anchor=tk.NW)
+        else:
+            self.itemconfigure(self._image_item, image=image)
+
 
 class Backgroundable(tk.Frame):
-    def __init__(self, parent, width, height, image_path=None, **kwargs):
+    def __init__(self, parent, width, height, image_path=None, surface=Canvasable, **kwargs):
         super().__init__(parent, width=width, height=height)
         self.pack_propagate(tk.FALSE)
-        self.inner = Canvasable(self, **kwargs)
+        self.inner = surface(self, **kwargs)
+        self._cached_image = None
         if image_path is not None:
             self.setImage(image_path)
         self.inner.pack(fill=tk.BOTH, expand=tk.TRUE)
+        _attachTag(self.inner, self)
 
     def setImage(self, image_path):
         try:
-            self.directSetImage(tk.PhotoImage(file=image_path))
+            image = image_cache.get(image_path)
         except tk.TclError:
             warn(f"guiABLE: Image not found: {image_path}", RuntimeWarning)
+            return
+        image_cache.release(self._cached_image)
+        self._cached_image = image
+        self.directSetImage(image)
 
     def directSetImage(self, image):
-        self.inner.configure(state=tk.NORMAL)
-        self.inner.delete(1.0, tk.END)
         self._img = image
-        self.inner.image_create(tk.END, image=self._img)
-        self.inner.configure(state=tk.DISABLED)
+        self.inner.showImage(image)
+
+    def rescale(self):
+        if self._cached_image is not None:
+            image, = image_cache.rescaled([self._cached_image])
+            if image is not self._cached_image:
+                self._cached_image = image
+                self.directSetImage(image)
+
+    def destroy(self):
+        _detachTag(self.inner)
+        image_cache.release(self._cached_image)
+        self._cached_image = None
+        super().destroy()
 
 
 class Hoverable(tk.Canvas):
@@ -67,8 +994,19 @@ class Hoverable(tk.Canvas):
 
         self.enabled = True
         self.moused_over = False
+        self._image_item = None
+        self._image = None
+        self._shown = 0
+        self._bg = None
+        self._cached_images = []
+        self._enable_pending = False    # Made in a building() block, which enables it on the way out.
         self.images = self._loadImages(image_paths)
-        self.enable()
+        _attachTag(self)
+        if _batches:
+            self._enable_pending = True
+            _batches[-1].widgets.append(self)
+        else:
+            self.enable()
 
     def _loadImages(self, image_paths):
         images = [[], [], [], []]
@@ -80,63 +1018,133 @@ class Hoverable(tk.Canvas):
 
     def _loadImg(self, img_location):
         try:
-            img_out = tk.PhotoImage(file=img_location)
+            img_out = image_cache.get(img_location)
+            self._cached_images.append(img_out)
         except tk.TclError:
             warn(f"guiABLE: Image not found: {img_location}", RuntimeWarning)
             img_out = []
         return img_out
 
+    def _releaseImages(self):
+        for image in self._cached_images:
+            image_cache.release(image)
+        self._cached_images = []
+
     def loadImages(self, image_paths):
+        self._releaseImages()
         self.images = self._loadImages(image_paths)
         updateHover(self)
 
+    def rescale(self):
+        old = self._cached_images
+        self._cached_images = image_cache.rescaled(old)
+        swap = {image.name: new for image, new in zip(old, self._cached_images) if new is not image}
+        if swap:
+            self.images = [swap.get(getattr(image, "name", None), image) for image in self.images]
+            if self._image_item is not None:
+                self._image = None
+                self._showImage(self._shown)
+
+    def destroy(self):
+        _detachTag(self)
+        self._releaseImages()
+        super().destroy()
+
+    def _showImage(self, index, bg=None):
+        # One image item per widget, re-pointed with itemconfigure. Skips Tk entirely when nothing changed.
+        if bg is not None and bg != self._bg:
+            self._bg = bg
+            self.configure(bg=bg)
+        self._shown = index
+        image = self.images[index]
+        if self._image_item is not None and image == self._image:
+            return
+        self._image = image
+        if self._image_item is None:
+            self._image_item = self.create_image(0, 0, image=image, anchor=tk.NW)
+        else:
+            self.itemconfigure(self._image_item, image=image)
+
     def mouseIn(self, event):
         self.moused_over = True
-        self.configure(bg="white")
-        self.create_image(0, 0, image=self.images[1], anchor=tk.NW)
+        self._showImage(1, "white")
 
     def mouseOut(self, event):
         self.moused_over = False
-        self.configure(bg="gray")
-        self.create_image(0, 0, image=self.images[0], anchor=tk.NW)
+        self._showImage(0, "gray")
 
     def enable(self):
-        self.bind("<Enter>", self.mouseIn)
-        self.bind("<Leave>", self.mouseOut)
         updateHover(self)
         self.enabled = True
 
     def disable(self):
-        self.unbind("<Enter>")
-        self.unbind("<Leave>")
-        self.create_image(0, 0, image=self.images[3], anchor=tk.NW)
+        self._enable_pending = False
+        self._showImage(3)
         self.enabled = False
 
 
 class Clickable(Hoverable):
-    def __init__(self, parent, function=lambda: None, image_paths=None, **kwargs):
+    POLICIES = ("inline", "thread", "asyncio")
+    BUSY = ("run", "drop", "coalesce")
+
+    def __init__(self, parent, function=lambda: None, image_paths=None, policy="inline", busy="run", on_result=None,
+                 show_busy=True, **kwargs):
+        # 'policy' is where function runs: "inline" on the Tk thread, or off it through callback_runner.
+        # 'busy' is what a click (or a held button's repeat) does while an earlier call is still running:
+        # "run" it anyway, "drop" it, or "coalesce" them all into one more call once the running one is done.
+        if policy not in self.POLICIES or busy not in self.BUSY:
+            raise ValueError(f"guiABLE: unknown policy {policy!r} or busy {busy!r}")
         self.function = function
+        self.policy = policy
+        self.busy = busy
+        self.on_result = on_result      # Called on the Tk thread with what an off-thread function returned.
+        self.show_busy = show_busy      # Show the disabled image while off-thread calls are running.
+        self._in_flight = 0
+        self._queued = False
+        self._state = (0, None)
         super().__init__(parent, image_paths, **kwargs)
 
     def clicked(self, event):
-        self.configure(bg="red")
-        self.create_image(0, 0, image=self.images[2], anchor=tk.NW)
-        self.function()
+        self._showImage(2, "red")
+        self._callFunction()
         updateHover(self)
 
+    def _dropping(self):
+        return self.policy != "inline" and self._in_flight and self.busy == "drop"
+
+    def _callFunction(self):
+        if self.policy == "inline":
+            return self.function()
+        if self._in_flight and self.busy != "run":
+            self._queued = self._queued or self.busy == "coalesce"
+            return None
+        self._in_flight += 1
+        if self._in_flight == 1 and self.show_busy:
+            self._showImage(*self._state)
+        return callback_runner.submit(self, self.function, self.policy, self._finished)
+
+    def _finished(self, future):
+        self._in_flight -= 1
+        error = None if future.cancelled() else future.exception()
+        if error is not None:
+            self._root().report_callback_exception(type(error), error, error.__traceback__)
+        elif self.on_result is not None and not future.cancelled():
+            self.on_result(future.result())
+        if self._in_flight or not self.winfo_exists():
+            return
+        if self._queued:
+            self._queued = False
+            self._callFunction()
+        elif self.show_busy:
+            self._showImage(*self._state)
+
+    def _showImage(self, index, bg=None):
+        self._state = (index, bg)
+        super()._showImage(3 if self._in_flight and self.show_busy else index, bg)
+
     def mouseUp(self, event):
         self.mouseIn(event) if self.moused_over else self.mouseOut(event)
 
-    def enable(self):
-        super().enable()
-        self.bind("<Button-1>", self.clicked)
-        self.bind("<ButtonRelease-1>", self.mouseUp)
-
-    def disable(self):
-        super().disable()
-        self.unbind("<Button-1>")
-        self.unbind("<ButtonRelease-1>")
-
 
 class Pushable(Clickable):
     def __init__(self, parent, function=lambda: None, image_paths=None, **kwargs):
@@ -152,13 +1160,12 @@ class Pushable(Clickable):
 
     def clicked(self, event):
         self._clicking = True
-        self.configure(bg="red")
-        self.create_image(0, 0, image=self.images[2], anchor=tk.NW)
+        self._showImage(2, "red")
 
     def mouseUp(self, event):
         self._clicking = False
         if self.moused_over:
-            self.function()
+            self._callFunction()
             updateHover(self)
 
 
@@ -175,16 +1182,20 @@ class Toggleable(Pushable):
     def mouseUp(self, event):
         self._clicking = False
         if self.moused_over:
-            self.state = not self.state
-            self.images = self.images[4:8] + self.images[0:4]
-            self.function()
+            if not self._dropping():    # A dropped click leaves the toggle as it was.
+                self.state = not self.state
+                self.images = self.images[4:8] + self.images[0:4]
+                self._callFunction()
             updateHover(self)
 
 
 class Holdable(Pushable):
-    def __init__(self, parent, function=lambda: None, image_paths=None, delay=100, init_delay=400, **kwargs):
+    def __init__(self, parent, function=lambda: None, image_paths=None, delay=100, init_delay=400,
+                 acceleration=1.0, min_delay=0, **kwargs):
         self.delay = delay
         self.init_delay = init_delay
+        self.acceleration = acceleration
+        self.min_delay = min_delay
         super().__init__(parent, function, image_paths, **kwargs)
 
     def mouseOut(self, event):
@@ -192,19 +1203,32 @@ class Holdable(Pushable):
 
     def mouseUp(self, event):
         self._clicking = False
+        repeat_scheduler.cancel(self)
         if self.moused_over:
             self.mouseIn(event)
 
     def clicked(self, event):
         super().clicked(event)
-        self.function()
+        self._callFunction()
         if self.function is not None:
-            self.after(self.init_delay, self._keepClicking)
+            self._startRepeat()
+
+    def _startRepeat(self):
+        repeat_scheduler.start(self, self._keepClicking, self.delay, self.init_delay, self.acceleration, self.min_delay)
 
     def _keepClicking(self):
         if self._clicking:
-            self.function()
-            self.after(self.delay, self._keepClicking)
+            self._callFunction()
+        else:
+            repeat_scheduler.cancel(self)
+
+    def disable(self):
+        repeat_scheduler.cancel(self)
+        super().disable()
+
+    def destroy(self):
+        repeat_scheduler.cancel(self)
+        super().destroy()
 
 
 class Draggable(Holdable):
@@ -214,6 +1238,11 @@ class Draggable(Holdable):
         super().clicked(event)
 
     def mouseDrag(self, event):
+        self._drag_event = event
+        frame_scheduler.schedule(self, "drag", self._applyDrag)
+
+    def _applyDrag(self):
+        event = self._drag_event
         x = event.x - self.x + self.winfo_x()
         y = event.y - self.y + self.winfo_y()
         x = _limitMove(x, self.winfo_width(), 0, self.master.winfo_width())
@@ -221,13 +1250,197 @@ class Draggable(Holdable):
 
         self.place_configure(x=x, y=y)
 
-    def enable(self):
-        self.bind("<B1-Motion>", self.mouseDrag)
-        super().enable()
 
-    def disable(self):
-        self.unbind("<B1-Motion>")
-        super().disable()
+class ItemHost(tk.Canvas):
+    # One canvas window holding any number of guiABLE widgets as canvas items, for keypads and palettes too big to
+    # give every cell its own X window. Make HoverItem, ClickItem, PushItem, ToggleItem or HoldItem with the host as
+    # parent and place() them. The host finds what's under the pointer in a grid of cell_size buckets and gives the
+    # items the same enter/leave/press/release calls Tk gives their windowed twins, button grab and all. Tk's canvas
+    # repaints only the area of the items that changed.
+    def __init__(self, parent, cell_size=64, **kwargs):
+        super().__init__(parent, highlightthickness=0, **kwargs)
+        self.cell_size = cell_size
+        self._cells = {}        # (column, row) : [(stacking order, item)] for items overlapping that cell
+        self._order = 0
+        self._hovered = None
+        self._pressed = None
+        self.bind("<Motion>", self._motion)
+        self.bind("<Leave>", self._leave)
+        self.bind("<Button-1>", self._press)
+        self.bind("<ButtonRelease-1>", self._release)
+        _attachTag(self)    # It has no handlers for the tag to call; this is only so setScale() can find it.
+
+    def _cellsOf(self, item):
+        size = self.cell_size
+        return [(column, row) for column in range(item._x // size, (item._x + max(1, item._width) - 1) // size + 1)
+                for row in range(item._y // size, (item._y + max(1, item._height) - 1) // size + 1)]
+
+    def _index(self, item):
+        for cell in self._cellsOf(item):
+            insort(self._cells.setdefault(cell, []), (item._order, item))
+
+    def _unindex(self, item):
+        for cell in self._cellsOf(item):
+            entries = self._cells.get(cell, [])
+            if (item._order, item) in entries:
+                entries.remove((item._order, item))
+            if not entries:
+                self._cells.pop(cell, None)
+
+    def itemAt(self, x, y):
+        for order, item in reversed(self._cells.get((x // self.cell_size, y // self.cell_size), ())):
+            if item._x <= x < item._x + item._width and item._y <= y < item._y + item._height:
+                return item
+        return None
+
+    def _hover(self, item, event):
+        if item is not self._hovered:
+            old, self._hovered = self._hovered, item
+            if old is not None and old.enabled:
+                old.mouseOut(event)
+            if item is not None and item.enabled:
+                item.mouseIn(event)
+
+    def _motion(self, event):
+        item = self.itemAt(event.x, event.y)
+        if self._pressed is not None and item is not self._pressed:
+            item = None     # Held down, only the pressed item hears about the pointer, as under Tk's button grab.
+        self._hover(item, event)
+
+    def _leave(self, event):
+        self._hover(None, event)
+
+    def _press(self, event):
+        self._motion(event)
+        item = self._hovered
+        if item is not None and item.enabled and hasattr(item, "clicked"):
+            self._pressed = item
+            item.clicked(event)
+
+    def _release(self, event):
+        item, self._pressed = self._pressed, None
+        if item is not None and item.enabled:
+            item.mouseUp(event)
+        self._motion(event)
+
+    def rescale(self):
+        for child in list(self.children.values()):
+            if isinstance(child, _Item):
+                child.rescale()
+
+    def destroy(self):
+        _detachTag(self)
+        super().destroy()
+
+
+class _Item(tk.Canvas):
+    # Stands in for the canvas window under Hoverable, so an item class is just a windowed class with this mixed in
+    # after it: PushItem(Pushable, _Item). It answers the few things Hoverable asks of its canvas with a handful of
+    # items on the host instead. Only place() positions it.
+    def __init__(self, host, width=0, height=0, **kwargs):
+        host._order += 1
+        self._host, self._order = host, host._order
+        self.master, self.tk = host, host.tk
+        self._name = f"item{self._order}"     # Also its canvas tag, so no "!": that's "not" in a tag search.
+        self._w = f"{host._w}.{self._name}"
+        self.children = {}
+        self._tclCommands = None
+        self._x = self._y = 0
+        self._width, self._height = int(width), int(height)
+        self._placed = False
+        self._rect = None
+        self._destroyed = False
+        host.children[self._name] = self
+
+    def create_image(self, x, y, **kwargs):
+        return self._host.create_image(self._x + x, self._y + y, tags=self._name,
+                                       state=tk.NORMAL if self._placed else tk.HIDDEN, **kwargs)
+
+    def itemconfigure(self, tag_or_id, cnf=None, **kwargs):
+        return self._host.itemconfigure(tag_or_id, cnf, **kwargs)
+
+    def configure(self, cnf=None, **kwargs):
+        bg = kwargs.get("bg", kwargs.get("background"))
+        if bg is not None and all(image == [] for image in self.images):   # Imageless, the background is all.
+            if self._rect is None:
+                self._rect = self._host.create_rectangle(self._x, self._y, self._x + self._width,
+                                                         self._y + self._height, width=0, tags=self._name,
+                                                         state=tk.NORMAL if self._placed else tk.HIDDEN)
+            self._host.itemconfigure(self._rect, fill=bg)
+
+    config = configure
+
+    def place(self, cnf=None, x=None, y=None, width=None, height=None, **kwargs):
+        # Items are placed by pixels only. What isn't given stays as it was, as with place_configure on a window.
+        kwargs.update(cnf or {})
+        x, y = kwargs.pop("x", x), kwargs.pop("y", y)
+        width, height = kwargs.pop("width", width), kwargs.pop("height", height)
+        if kwargs:
+            raise TypeError(f"guiABLE: items can't be placed with {', '.join(sorted(kwargs))}; "
+                            f"only x, y, width and height")
+        if self._placed:
+            self._host._unindex(self)
+        x = self._x if x is None else int(x)
+        y = self._y if y is None else int(y)
+        self._host.move(self._name, x - self._x, y - self._y)
+        if not self._placed:
+            self._host.itemconfigure(self._name, state=tk.NORMAL)
+        self._x, self._y, self._placed = x, y, True
+        if width is not None or height is not None:
+            self._width = self._width if width is None else int(width)
+            self._height = self._height if height is None else int(height)
+            if self._rect is not None:
+                self._host.coords(self._rect, x, y, x + self._width, y + self._height)
+        self._host._index(self)
+
+    place_configure = place
+
+    def place_forget(self):
+        if self._placed:
+            self._host._unindex(self)
+            self._host.itemconfigure(self._name, state=tk.HIDDEN)
+            self._placed = False
+            if self._host._hovered is self:
+                self._host._hovered = None
+
+    def winfo_exists(self):
+        return not self._destroyed and self._host.winfo_exists()
+
+    def winfo_x(self):
+        return self._x
+
+    def winfo_y(self):
+        return self._y
+
+    def winfo_width(self):
+        return self._width
+
+    def winfo_height(self):
+        return self._height
+
+    def destroy(self):
+        if not self._destroyed:
+            self._destroyed = True
+            self.place_forget()
+            if self._host._pressed is self:
+                self._host._pressed = None
+            self._host.delete(self._name)
+            self._host.children.pop(self._name, None)
+
+
+class HoverItem(Hoverable, _Item): pass
+
+
+class ClickItem(Clickable, _Item): pass
+
+
+class PushItem(Pushable, _Item): pass
+
+
+class ToggleItem(Toggleable, _Item): pass
+
+
+class HoldItem(Holdable, _Item): pass
 
 
 class Troughable(Backgroundable):
@@ -240,47 +1453,51 @@ class Troughable(Backgroundable):
         self.images = img_list
         self.enable()
 
+    def _showImage(self, index):
+        if self.images is not None:
+            self.directSetImage(self.images[index])
+
     def mouseOut(self, event):
-        self.directSetImage(self.images[0])
+        self._showImage(0)
 
     def mouseIn(self, event):
-        self.directSetImage(self.images[1])
+        self._showImage(1)
 
     def clicked(self, event):
-        self.directSetImage(self.images[2])
+        self._showImage(2)
 
     def mouseUp(self, event):
-        self.directSetImage(self.images[1])
+        self._showImage(1)
 
     def enable(self):
         if self.images is not None:
-            self.inner.bind("<Enter>", self.mouseIn)
-            self.inner.bind("<Leave>", self.mouseOut)
-            self.inner.bind("<Button-1>", self.clicked, "+")
-            self.inner.bind("<ButtonRelease-1>", self.mouseUp, "+")
             updateHover(self)
         self.enabled = True
 
     def disable(self):
-        self.inner.unbind("<Enter>")
-        self.inner.unbind("<Leave>")
-        self.inner.unbind("<Button-1>")
-        self.inner.unbind("<ButtonRelease-1>")
-        if self.images is not None:
-            self.directSetImage(self.images[3])
+        self._showImage(3)
         self.enabled = False
 
 
 class Scrollable(Holdable):
-    def __init__(self, parent, trough_width, trough_height, handle_width, handle_height, scrollwheel_speed=10, **kwargs):
+    def __init__(self, parent, trough_width, trough_height, handle_width, handle_height, scrollwheel_speed=10,
+                 smooth_scroll=False, **kwargs):
         self.scrollwheel_speed = scrollwheel_speed
+        self.smooth_scroll = smooth_scroll
+        self.smooth_step = .35      # Share of the outstanding wheel distance covered each frame when smooth scrolling.
+        self._wheel_delta = 0
         self.linked = False
         self.page_percent = .9
+        self.min_handle = None      # Shortest the handle gets, in pixels; None for the bar's breadth.
         self._skin = None
+        self._in_layout = False
+        self._layout_size = None
+        self._placed_y = None       # Handle y last set from the content's own offset, not to be fed back to it.
 
         super().__init__(parent, lambda: None, width=trough_width, height=trough_height, **kwargs)
-        self.trough = Troughable(self, trough_width, trough_height)
+        self.trough = Troughable(self, trough_width, trough_height, surface=ImageSurface)
         self.trough.place(x=0, y=0)
+        _attachTag(self.trough.inner, self, ("clicked", "mouseUp"))
         self.handle = Draggable(self.trough.inner, width=handle_width, height=handle_height)
         self.handle.place(x=0, y=-0)
 
@@ -289,7 +1506,7 @@ class Scrollable(Holdable):
             self.trough.enable()
             self.handle.enable()
             if self.linked: self._linkTo()
-            if self._skin is not None: self._skin.drawTo(self)
+            if self._skin is not None and not self._in_layout: self._skin.drawTo(self)
         super().enable()
 
     def disable(self):
@@ -299,78 +1516,121 @@ class Scrollable(Holdable):
 
     def setSkin(self, ScrollSkin): self._skin = ScrollSkin
 
+    def rescale(self):
+        super().rescale()
+        if self._skin is not None and self._layout_size is not None:
+            self._skin.drawTo(self)
+
+    def destroy(self):
+        wheel_router.unregister(self)
+        super().destroy()
+
     def linkTo(self, ScrollableCanvas, movement_modifier=-1, active_handle_xy=(True, True), canvas_offset=(0.0, 0.0)):
         self.movement_modifier = movement_modifier
         self._linked = ScrollableCanvas
-        self._linkedwidth = self._linked.inner.winfo_width()
-        self._linkedheight = self._linked.inner.winfo_height()
+        if self not in self._linked.bars:
+            self._linked.bars.append(self)
         self.active_handle_x, self.active_handle_y = active_handle_xy
         self.x_offset, self.y_offset = canvas_offset
         self._linkTo()
 
     def _linkTo(self):
         if self.active_handle_y:
-            self.bind_all("<MouseWheel>", self.scroll, "+")
-        self.handle.bind("<Configure>", self._moveCanvas)
-        self.trough.inner.bind("<Button-1>", self.clicked)
-        self.trough.inner.bind("<ButtonRelease-1>", self.mouseUp)
-        self._linked.inner.bind("<Configure>", self._resize_handle, "+")
-        self.bind("<Configure>", self._resize_handle)
+            wheel_router.register(self._linked, self)
+        if not self.linked:
+            self.handle.bind("<Configure>", self._moveCanvas)
+            self._linked.inner.bind("<Configure>", self._resize_handle, "+")
+            self.bind("<Configure>", self._resize_handle)
         self.linked = True
 
     def _resize_handle(self, event):
-        #self.update_idletasks()
-        #self._linked.update_idletasks()
-        if self._linkedwidth != self._linked.inner.winfo_width() or self._linkedheight != self._linked.inner.winfo_height():
-            self.resize_handle()
+        self._linked.requestLayout()
 
     def resize_handle(self):
-        if not self.active_handle_x or self._linked.inner.winfo_width() < self._linked.inner_width:
-            self.handle.config(width=self.trough.winfo_width())
-        else:
-            self.enable()
-            self.handle.config(width=self.winfo_width() / self._linked.inner.winfo_width() * self._linked.inner_width)
-        if not self.active_handle_y or self._linked.inner.winfo_height() <= self._linked.inner_height:
-            self.handle.config(height=self.trough.winfo_height())
-        else:
-            self.enable()
-            self.handle.config(height=self.winfo_height() / self._linked.inner.winfo_height() * self._linked.inner_height)
-
-        if self._skin is not None:
-            self._skin.drawTo(self)
+        self.layout()
+
+    def layout(self, trough_width=None, trough_height=None):
+        # Sizes the handle from the numbers it's given (or reads them once), and only touches Tk for what changed:
+        # the skin is drawn at most once, and only when the handle or trough actually changed size.
+        trough_width = self.trough.winfo_width() if trough_width is None else trough_width
+        trough_height = self.trough.winfo_height() if trough_height is None else trough_height
+        content_width, content_height = self._linked.contentSize()
+        handle_width, handle_height = trough_width, trough_height
+        minimum = min(trough_width, trough_height) if self.min_handle is None else self.min_handle
+        if self.active_handle_x and content_width and content_width >= self._linked.inner_width:
+            handle_width = round(max(min(minimum, trough_width), self._handleLength(
+                trough_width / content_width * self._linked.inner_width, trough_width)))
+        if self.active_handle_y and content_height and content_height > self._linked.inner_height:
+            handle_height = round(max(min(minimum, trough_height), self._handleLength(
+                trough_height / content_height * self._linked.inner_height, trough_height)))
+
+        scrolls = (handle_width, handle_height) != (trough_width, trough_height)
+        changed = (handle_width, handle_height, trough_width, trough_height) != self._layout_size
+        self._layout_size = (handle_width, handle_height, trough_width, trough_height)
+        if changed:
+            self.handle.config(width=handle_width, height=handle_height)
+        self._in_layout = True
+        try:
+            if scrolls and not self.enabled:
+                self.enable()
+            if changed and self._skin is not None:
+                self._skin.drawTo(self)
+            if not scrolls and (self.enabled or changed):
+                self.disable()
+        finally:
+            self._in_layout = False
+
+    def _handleLength(self, length, trough_length):
+        return length if self._skin is None else self._skin.quantizeLength(length, trough_length)
 
-        if self.handle.winfo_width() == self.trough.winfo_width() and \
-                self.handle.winfo_height() == self.trough.winfo_height():
-            self.disable()
+    def clicked(self, event):
+        self._pageTo(event.x, event.y)
+        if not self._clicking:
+            self._clicking = True
+            self._startRepeat()
 
-        self._linkedwidth = self._linked.inner.winfo_width()
-        self._linkedheight = self._linked.inner.winfo_height()
+    def _pageTo(self, x, y):
+        self._linked.pageContent(self, x, y) if self.linked else self._pageHandle(x, y)
 
-    def clicked(self, event):
+    def _pageHandle(self, x, y):
         if self.active_handle_x:
-            new_x = self._limitPage(event.x, self.handle.winfo_x(), self.handle.winfo_width(),
+            new_x = self._limitPage(x, self.handle.winfo_x(), self.handle.winfo_width(),
                                     self.trough.winfo_width(), self.page_percent)
             self.handle.place_configure(x=new_x)
         if self.active_handle_y:
-            new_y = self._limitPage(event.y, self.handle.winfo_y(), self.handle.winfo_height(),
+            new_y = self._limitPage(y, self.handle.winfo_y(), self.handle.winfo_height(),
                                     self.trough.winfo_height(), self.page_percent)
             self.handle.place_configure(y=new_y)
 
-        if not self._clicking:
-            self.after(self.init_delay, self._keepClicking)
-            self._clicking = True
-
     def _keepClicking(self):
         if self._clicking:
             event_x, event_y, mouse_in = _getLocalMouse(self.trough.inner)
-            self.trough.inner.event_generate("<Button-1>", x=event_x, y=event_y)
-            self.after(self.delay, self._keepClicking)
+            self._pageTo(event_x, event_y)
+        else:
+            repeat_scheduler.cancel(self)
 
     def scroll(self, event):
         x, y, moused_over = _getLocalMouse(self._linked)
-        if moused_over and self.enabled:
+        if moused_over:
+            self.scrollBy(event.delta)
+
+    def scrollBy(self, delta):
+        self._wheel_delta += delta
+        frame_scheduler.schedule(self, "wheel", self._applyWheel)
+
+    def _applyWheel(self):
+        delta = self._wheel_delta
+        if self.smooth_scroll and abs(delta) > self.scrollwheel_speed:
+            delta *= self.smooth_step
+        self._wheel_delta -= delta
+        self._linked.scrollContent(self, delta) if self.linked else self._scrollHandle(delta)
+        if self._wheel_delta:
+            frame_scheduler.schedule(self, "wheel", self._applyWheel, animate=True)
+
+    def _scrollHandle(self, delta):
+        if self.enabled:
             y = self.handle.winfo_y()
-            speed = event.delta / self.scrollwheel_speed
+            speed = delta / self.scrollwheel_speed
 
             if y - speed < 0:
                 self.handle.place_configure(y=0)
@@ -383,6 +1643,12 @@ class Scrollable(Holdable):
                 else:
                     self.handle.place_configure(y=y-speed)
 
+    def _syncHandle(self, fraction):
+        # Puts the handle where content scrolled by its own offset says it is, without moving the content again.
+        if self.enabled:
+            self._placed_y = round(fraction * (self.trough.winfo_height() - self.handle.winfo_height()))
+            self.handle.place_configure(y=self._placed_y)
+
     def _limitPage(self, event, origin, size, max, restrict=1.0):
         if origin < event < origin + size:
             return origin
@@ -391,22 +1657,51 @@ class Scrollable(Holdable):
         return _limitMove(origin + size * restrict, size, 0, max)
 
     def _moveCanvas(self, event):
+        self._move_event = event
+        frame_scheduler.schedule(self, "move", self._applyMove)
+
+    def _applyMove(self):
+        event = self._move_event
+        content_width, content_height = self._linked.contentSize()
         if self.active_handle_x:
             if self.handle.winfo_width() < self._linked.inner_width:
-                x = event.x * ((self._linked.inner.winfo_width()-self._linked.inner_width) /
+                x = event.x * ((content_width-self._linked.inner_width) /
                                (self.trough.winfo_width()-self.handle.winfo_width()) * self.movement_modifier)
             else: x = 0.0
-            self._linked.inner.place_configure(x=x + self.x_offset)
+            self._linked.moveContent(x=x + self.x_offset)
 
-        if self.active_handle_y:
+        placed, self._placed_y = self._placed_y, None
+        if self.active_handle_y and event.y != placed:
             if self.handle.winfo_height() < self._linked.inner_height:
-                y = event.y * ((self._linked.inner.winfo_height()-self._linked.inner_height) /
+                y = event.y * ((content_height-self._linked.inner_height) /
                                (self.trough.winfo_height()-self.handle.winfo_height()) * self.movement_modifier)
             else: y = 0.0
-            self._linked.inner.place_configure(y=y + self.y_offset)
+            self._linked.moveContent(y=y + self.y_offset)
+
+
+class ScrollableCanvas(Troughable):
+    def __init__(self, parent, width, height, **kwargs):
+        self.bars = []      # Scrollables linked to this canvas.
+        super().__init__(parent, width, height, **kwargs)
+
+    def requestLayout(self, event=None):
+        frame_scheduler.schedule(self, "layout", self.layout)
 
+    def layout(self):
+        for bar in self.bars:
+            bar.layout()
 
-class ScrollableCanvas(Troughable): pass
+    def contentSize(self):
+        return self.inner.winfo_width(), self.inner.winfo_height()
+
+    def moveContent(self, **kwargs):
+        self.inner.place_configure(**kwargs)
+
+    def scrollContent(self, bar, delta):
+        bar._scrollHandle(delta)
+
+    def pageContent(self, bar, x, y):
+        bar._pageHandle(x, y)
 
 
 class ScrollablePane(ScrollableCanvas):
@@ -414,12 +1709,17 @@ class ScrollablePane(ScrollableCanvas):
         super().__init__(parent, width=width, height=height)
         h_on, v_on = scrollbars
         self.h_auto, self.v_auto = auto
+        self.bar_size = bar_size
+        self._v_fixed = v_on and not self.v_auto
+        self._h_fixed = h_on and not self.h_auto
+        self._size = (width, height)
+        self._content_size = None   # Inner canvas size as of its last <Configure>.
 
         self._skin = None
-        if self.h_auto or self.v_auto:
-            self.inner.bind("<Configure>", self.showBars)
-        self.inner_width = width - bar_size * v_on * (not self.v_auto)
-        self.inner_height = height - bar_size * h_on * (not self.h_auto)
+        self.inner.bind("<Configure>", self._innerConfigured, "+")
+        self.bind("<Configure>", self._paneConfigured, "+")
+        self.inner_width = width - bar_size * self._v_fixed
+        self.inner_height = height - bar_size * self._h_fixed
 
         self.v_scroll = Scrollable(self, bar_size, height, bar_size, bar_size)
         self.v_scroll.place(x=self.inner_width, y=0)
@@ -428,35 +1728,45 @@ class ScrollablePane(ScrollableCanvas):
         self.h_scroll = Scrollable(self, self.inner_width, bar_size, bar_size, bar_size)
         self.h_scroll.place(x=0, y=self.inner_height)
         self.h_scroll.linkTo(self, -1, (True, False))
+        self.requestLayout()
 
-    def showBars(self, event):
-        changed = False
-        if self.v_auto:
-            if self.inner.winfo_height() > self.inner_height and self.v_scroll.winfo_x() == self.winfo_width():
-                self.inner_width -= self.v_scroll.winfo_width()
-                changed = True
-            elif self.inner.winfo_height() < self.inner_height and self.v_scroll.winfo_x() < self.winfo_width():
-                self.inner_width = self.winfo_width()
-                changed = True
-
-        if self.h_auto:
-            if self.inner.winfo_width() > self.inner_width and self.h_scroll.winfo_y() == self.winfo_height():
-                self.inner_height -= self.h_scroll.winfo_height()
-                changed = True
-            elif self.inner.winfo_width() < self.inner_width and self.h_scroll.winfo_y() != self.inner_height:
-                    self.inner_height = self.winfo_height()
-                    changed = True
+    def _innerConfigured(self, event):
+        self._content_size = (event.width, event.height)
+        self.requestLayout()
 
-        if changed:
+    def _paneConfigured(self, event):
+        self._size = (event.width, event.height)
+        self.requestLayout()
+
+    def contentSize(self):
+        return self._content_size if self._content_size is not None else super().contentSize()
+
+    def showBars(self, event=None):
+        self.requestLayout()
+
+    def layout(self):
+        # One pass over everything a geometry change can touch. <Configure> handlers only mark the pane dirty
+        # (requestLayout), so a burst of changes settles in a single pass on the next frame.
+        content_width, content_height = self.contentSize()
+        width, height = self._size
+        v_show, h_show = self._v_fixed, self._h_fixed
+        for n in range(2):      # Either bar showing can take away the room that makes the other one necessary.
             if self.v_auto:
-                self.h_scroll.trough.configure(width=self.inner_width)
-                self.h_scroll.place_configure(width=self.inner_width)
-                self.v_scroll.place_configure(x=self.inner_width)
-                self.v_scroll.resize_handle()
+                v_show = content_height > height - self.bar_size * h_show
             if self.h_auto:
-                self.h_scroll.place_configure(y=self.inner_height, width=self.inner_width)
-                self.h_scroll.trough.configure(width=self.inner_width)
-                self.h_scroll.resize_handle()
+                h_show = content_width > width - self.bar_size * v_show
+
+        inner_width, inner_height = width - self.bar_size * v_show, height - self.bar_size * h_show
+        if (inner_width, inner_height) != (self.inner_width, self.inner_height):
+            self.inner_width, self.inner_height = inner_width, inner_height
+            self.v_scroll.place_configure(x=inner_width)
+            self.h_scroll.place_configure(y=inner_height, width=inner_width)
+            self.h_scroll.trough.configure(width=inner_width)
+        self.v_scroll.layout(self.bar_size, height)
+        self.h_scroll.layout(inner_width, self.bar_size)
+        for bar in self.bars:
+            if bar is not self.v_scroll and bar is not self.h_scroll:
+                bar.layout()
 
     def setSkin(self, ScrollSkin):
         self.v_scroll._skin = ScrollSkin
@@ -473,18 +1783,219 @@ class ScrollablePane(ScrollableCanvas):
         super().enable()
 
 
+class VirtualPane(ScrollablePane):
+    def __init__(self, parent, width, height, bar_size, row_factory, row_filler, row_count=0, row_height=20,
+                 overscan=2, scrollbars=(False, False), auto=(False, False)):
+        self.row_factory = row_factory  # row_factory(parent) -> a new row widget
+        self.row_filler = row_filler    # row_filler(row, index) -> show item 'index' in a new or recycled row
+        self.overscan = overscan
+        self._row_height = row_height   # Pixels, or a callable(index) measuring each row.
+        self.measure_block = 256        # Rows a callable row_height is asked about at a time.
+        self._top = 0
+        self._rows = {}                 # index : row widget currently in the strip
+        self._spare = []                # Hidden rows waiting to be recycled.
+        self._span = None
+        self.wheel_step = 60            # Pixels scrolled per wheel notch, whatever the list's length.
+        self._measure(row_count)
+        super().__init__(parent, width, height, bar_size, scrollbars, auto)
+        # Only the visible rows exist, inside a strip that scrolls as one window; rows are rebuilt as it runs out.
+        self.strip = tk.Frame(self.inner, bg=self.inner.cget("bg"))
+        self.refresh()
+
+    def _measure(self, row_count):
+        # A callable row_height is asked about a block of rows at a time, when a block is first about to be shown.
+        # Until then a block counts as the first block's average height, so the cost of a list, to start and to
+        # keep, is the blocks actually scrolled past, not its length.
+        self.row_count = row_count
+        self._blocks = {}       # block : row offsets within it, for blocks measured so far
+        self._deltas = {}       # Fenwick tree over blocks of measured minus estimated height; only touched blocks
+        self._block_count = -(-row_count // self.measure_block)
+        self._estimate = self._row_height
+        if callable(self._row_height):
+            self._estimate = 1
+            if row_count:
+                self._estimate = round(self._measureBlock(0) / min(row_count, self.measure_block)) or 1
+                self._adjust(0)
+
+    def _measureBlock(self, block):
+        first = block * self.measure_block
+        offsets = [0]
+        for index in range(first, min(first + self.measure_block, self.row_count)):
+            offsets.append(offsets[-1] + self._row_height(index))
+        self._blocks[block] = offsets
+        return offsets[-1]
+
+    def _adjust(self, block):
+        offsets = self._blocks[block]
+        delta, node = offsets[-1] - (len(offsets) - 1) * self._estimate, block + 1
+        while node <= self._block_count:
+            self._deltas[node] = self._deltas.get(node, 0) + delta
+            node += node & -node
+
+    def _reach(self):
+        # Measures the blocks about to be shown, keeping the row at the top of the pane where it was.
+        measured = False
+        while True:
+            anchor = self._rowAt(self._top)
+            inside = self._top - self._rowTop(anchor)
+            first = max(0, anchor - self.overscan)
+            last = min(self.row_count, self._rowAt(self._top + self.inner_height) + 1 + self.overscan)
+            missing = [block for block in range(first // self.measure_block, (last - 1) // self.measure_block + 1)
+                       if block not in self._blocks]
+            if not missing:
+                return measured
+            for block in missing:
+                self._measureBlock(block)
+                self._adjust(block)
+            self._top = max(0, min(self._rowTop(anchor) + inside, self._rowTop(self.row_count) - self.inner_height))
+            measured = True
+
+    def _blockTop(self, block):
+        top, node = block * self.measure_block * self._estimate, block
+        while node > 0:
+            top += self._deltas.get(node, 0)
+            node -= node & -node
+        return top
+
+    def _rowTop(self, index):
+        if not callable(self._row_height):
+            return index * self._row_height
+        block, within = divmod(index, self.measure_block)
+        offsets = self._blocks.get(block)
+        return self._blockTop(block) + (within * self._estimate if offsets is None else offsets[within])
+
+    def _rowAt(self, y):
+        if not callable(self._row_height):
+            index = int(y // self._row_height)
+        else:
+            low, high = 0, self._block_count - 1     # The last block starting at or above y.
+            while low < high:
+                middle = (low + high + 1) // 2
+                low, high = (middle, high) if self._blockTop(middle) <= y else (low, middle - 1)
+            offsets, y = self._blocks.get(low), y - self._blockTop(low)
+            within = int(y // self._estimate) if offsets is None else bisect_right(offsets, y) - 1
+            index = low * self.measure_block + within
+        return max(0, min(index, self.row_count - 1))
+
+    def contentSize(self):
+        return self.inner_width, self._rowTop(self.row_count)
+
+    def moveContent(self, x=None, y=None):
+        if y is not None:
+            self._top = max(0, min(round(-y), self._rowTop(self.row_count) - self.inner_height))
+            self.refresh()
+
+    # With a long enough list a handle pixel is hundreds of rows, so the wheel and paging move the pane's own pixel
+    # offset and the handle follows it, rather than the other way round.
+    def scrollTo(self, top):
+        self._top = max(0, min(round(top), self._rowTop(self.row_count) - self.inner_height))
+        self.refresh()
+        scrollable = self._rowTop(self.row_count) - self.inner_height
+        for bar in self.bars:
+            if bar.active_handle_y:
+                bar._syncHandle(self._top / scrollable if scrollable > 0 else 0)
+
+    def scrollContent(self, bar, delta):
+        if bar.active_handle_y:
+            self.scrollTo(self._top - delta * self.wheel_step / 120)
+        else:
+            super().scrollContent(bar, delta)
+
+    def pageContent(self, bar, x, y):
+        if not bar.active_handle_y:
+            return super().pageContent(bar, x, y)
+        handle_y = bar.handle.winfo_y()
+        if y < handle_y:
+            self.scrollTo(self._top - self.inner_height * bar.page_percent)
+        elif y > handle_y + bar.handle.winfo_height():
+            self.scrollTo(self._top + self.inner_height * bar.page_percent)
+
+    def refresh(self, refill=False):
+        first, last = 0, 0
+        if callable(self._row_height) and self.row_count and self._reach():
+            self.requestLayout()    # Measuring changed the content's height; the bars follow.
+        if self.row_count:
+            first = max(0, self._rowAt(self._top) - self.overscan)
+            last = min(self.row_count, self._rowAt(self._top + self.inner_height) + 1 + self.overscan)
+        if refill or (first, last) != self._span:
+            self._layoutRows(first, last, refill)
+        self.strip.place_configure(x=0, y=self._rowTop(first) - self._top)
+
+    def _layoutRows(self, first, last, refill=False):
+        released = [self._rows.pop(index) for index in list(self._rows) if not first <= index < last]
+        base = self._rowTop(first)
+        for index in range(first, last):
+            row = self._rows.get(index)
+            if row is None:
+                if released:
+                    row = released.pop()
+                elif self._spare:
+                    row = self._spare.pop()
+                else:
+                    row = self.row_factory(self.strip)
+                self._rows[index] = row
+                self.row_filler(row, index)
+            elif refill:
+                self.row_filler(row, index)
+            top = self._rowTop(index)
+            row.place_configure(x=0, y=top - base, width=self.inner_width, height=self._rowTop(index + 1) - top)
+        for row in released:
+            row.place_forget()
+        self._spare.extend(released)
+        self.strip.place_configure(width=self.inner_width, height=max(1, self._rowTop(last) - base))
+        self._span = (first, last)
+
+    def refreshRows(self):
+        self.refresh(refill=True)
+
+    def setRowCount(self, row_count):
+        self._measure(row_count)
+        self._top = max(0, min(self._top, self._rowTop(row_count) - self.inner_height))
+        self.refreshRows()
+        self.requestLayout()
+
+    def layout(self):
+        inner_width = self.inner_width
+        super().layout()
+        if self.inner_width != inner_width:     # A bar came or went; rows take the new width.
+            self._span = None
+        self.scrollTo(self._top)    # The handle may have changed length; keep it on the rows being shown.
+
+
 class ScrollSkin:
-    def __init__(self, trough_paths, handle_paths, linkTo=None):
+    def __init__(self, trough_paths, handle_paths, linkTo=None, cache_size=64, quantize=1, prebuilt=None):
+        self.cache_size = cache_size
+        self.quantize = quantize    # Snap handle lengths to multiples of this many pixels, so resizes reuse sprites.
+        self.prebuilt = prebuilt or {}  # (brush paths, width, height, horizontal) : path of the bar composed ahead
+        self._bars = OrderedDict()  # (brush names, width, height, horizontal) : composed sprite, oldest first
         self._trough_paths = self._conform_pairs(trough_paths)
         self._handle_paths = self._conform_pairs(handle_paths)
+        self._sprites = None
+        self._sprite_key = None     # (scale, root) the sprites were loaded for
+        self._deferred = set()
+        self._brush_data = {}   # brush name : pixel rows, (name, mirror_x, mirror_y, rotate) : data for put()
         if linkTo is not None:
             self.linkTo(linkTo)
 
     def linkTo(self, Scrollable): Scrollable.setSkin(self)
 
     def drawTo(self, Scrollable, horizontal=False):
-        trough_sprites = [tk.PhotoImage(file=n) for n in self._trough_paths]
-        handle_sprites = [tk.PhotoImage(file=n) for n in self._handle_paths]
+        if self._sprite_key != (image_cache.scale, tk._default_root):
+            if self._sprites is not None:
+                for sprite in self._sprites[0] + self._sprites[1] + list(self._bars.values()):
+                    image_cache.release(sprite)
+                self._bars.clear()
+                self._brush_data.clear()
+            self._sprite_key = (image_cache.scale, tk._default_root)
+            self._sprites = ([image_cache.get(n) for n in self._trough_paths],
+                             [image_cache.get(n) for n in self._handle_paths])
+        trough_sprites, handle_sprites = self._sprites
+        sprites = trough_sprites + handle_sprites
+        if image_cache.pending(sprites):    # Still loading asynchronously; draw once they arrive.
+            if Scrollable not in self._deferred:
+                self._deferred.add(Scrollable)
+                image_cache.whenReady(lambda: self._drawDeferred(Scrollable, horizontal), sprites)
+            return
 
         troughs, handles = ([], [])
         Scrollable.update_idletasks()
@@ -493,15 +2004,39 @@ class ScrollSkin:
             self._drawPairs(self._handle_paths, handle_sprites, pair, handles, Scrollable.handle, horizontal)
         Scrollable.trough.setImage(troughs)
         Scrollable.handle.images = handles
-        updateHover(Scrollable.trough)
-        updateHover(Scrollable.handle)
+        if Scrollable.enabled:
+            updateHovers((Scrollable.trough, Scrollable.handle))
+        else:   # setImage() enabled the trough; a bar with nothing to scroll (maybe drawn late) stays disabled.
+            Scrollable.disable()
+
+    def _drawDeferred(self, Scrollable, horizontal):
+        self._deferred.discard(Scrollable)
+        if Scrollable.winfo_exists():
+            self.drawTo(Scrollable, horizontal)
 
     def _drawPairs(self, in_paths, in_images, pair, out_imgs, widget, override=False):
         if len(in_paths) > pair:
-            out_imgs.append(self.drawBar(in_images[pair:pair+2], widget.winfo_width(), widget.winfo_height(), override))
+            out_imgs.append(self._cachedBar(in_images[pair:pair+2], widget.winfo_width(), widget.winfo_height(),
+                                            override, in_paths[pair:pair+2]))
         else:
             out_imgs.append(out_imgs[0])
 
+    def _cachedBar(self, images, width, height, horizontal, paths=()):
+        key = (tuple(img.name for img in images), width, height, horizontal or width > height)
+        bar = self._bars.pop(key, None)
+        if bar is None:
+            prebuilt = self.prebuilt.get((tuple(paths),) + key[1:]) if image_cache.scale == 1 else None
+            bar = self.drawBar(images, width, height, horizontal) if prebuilt is None else image_cache.get(prebuilt)
+        self._bars[key] = bar
+        while len(self._bars) > self.cache_size:
+            image_cache.release(self._bars.popitem(last=False)[1])
+        return bar
+
+    def quantizeLength(self, length, limit):
+        if self.quantize > 1:
+            length = min(limit, max(self.quantize, round(length / self.quantize) * self.quantize))
+        return length
+
     def drawBar(self, images, width, height, horizontal):
         newimg = tk.PhotoImage(width=width, height=height)
         cap_w, cap_h = (images[1].width(), images[1].height())
@@ -528,15 +2063,209 @@ class ScrollSkin:
         return pairs_list
 
     def _putToImage(self, brush, canvas, bbox, mirror_x=False, mirror_y=False, rotate=False):
-        value1 = brush.height() if rotate else brush.width()
-        value2 = brush.width() if rotate else brush.height()
-        start1, end1, increment1 = (value1-1, -1, -1) if mirror_x else (0, value1, 1)
-        start2, end2, increment2 = (value2-1, -1, -1) if mirror_y else (0, value2, 1)
-
-        data = ""
-        for col in range(start2, end2, increment2):
-            data = data + "{"
-            for row in range(start1, end1, increment1):
-                data = data + "#%02x%02x%02x " % brush.get(col if rotate else row, row if rotate else col)
-            data = data + "} "
-        canvas.put(data, to=bbox)
+        canvas.put(self._brushData(brush, mirror_x, mirror_y, rotate), to=bbox)   # put() tiles the brush over bbox.
+
+    def _brushData(self, brush, mirror_x=False, mirror_y=False, rotate=False):
+        key = (brush.name, mirror_x, mirror_y, rotate)
+        if key not in self._brush_data:
+            rows = self._brush_data.get(brush.name)
+            if rows is None:
+                rows = self._brush_data[brush.name] = _photoRows(brush)
+            if rotate:
+                rows = list(zip(*rows))
+            if mirror_x:
+                rows = [row[::-1] for row in rows]
+            if mirror_y:
+                rows = rows[::-1]
+            self._brush_data[key] = _rowsData(rows)
+        return self._brush_data[key]
+
+
+class SkinBundle:
+    # A compiled skin (see compileSkin), opened. Opening reads just the manifest; each image is decoded the first
+    # time something shows it, by image_cache, which takes "<file>#<image>" paths the way it takes atlas regions.
+    # A file named *.skin needs no opening for that; one named anything else is only known once opened here.
+    def __init__(self, skin_path):
+        self.path = skin_path
+        self.manifest = image_cache.openSkin(skin_path)
+
+    def paths(self, *names):
+        return [f"{self.path}#{name}" for name in names]
+
+    def background(self, name):
+        return self.paths(self.manifest["backgrounds"][name])[0]
+
+    def button(self, name):
+        return self.paths(*self.manifest["buttons"][name])
+
+    def toggle(self, name):
+        return tuple(self.paths(*names) for names in self.manifest["toggles"][name])   # image_paths1, image_paths2
+
+    def scrollSkin(self, name, **kwargs):
+        entry = self.manifest["scrollbars"][name]
+        parts = {part: self.paths(*entry[part]) for part in ("trough", "handle")}
+        prebuilt = {(tuple(parts[part][pair:pair+2]), width, height, width > height): self.paths(bar)[0]
+                    for part, pair, width, height, bar in entry["bars"]}
+        return ScrollSkin(parts["trough"], parts["handle"], prebuilt=prebuilt, **kwargs)
+
+
+class CountingTk:
+    # Stands in for a widget's tkapp and counts every call that crosses into the Tcl interpreter.
+    def __init__(self, tk_app):
+        self._tk = tk_app
+        self.calls = 0
+
+    def call(self, *args):
+        self.calls += 1
+        return self._tk.call(*args)
+
+    def eval(self, script):
+        self.calls += 1
+        return self._tk.eval(script)
+
+    def __getattr__(self, name):
+        return getattr(self._tk, name)
+
+
+class Tracer:
+    HANDLERS = ("mouseIn", "mouseOut", "clicked", "mouseUp", "mouseDrag", "scroll", "scrollBy", "_moveCanvas",
+                "_applyDrag", "_applyMove", "_applyWheel", "showBars", "layout", "drawTo", "_callFunction",
+                "rescale")
+    FUNCTIONS = ("updateHover", "updateHovers")
+    BUCKETS = (.1, .25, .5, 1, 2, 4, 8, 16, 33, 66, 133, float("inf"))    # Histogram upper bounds, in ms.
+
+    def __init__(self):
+        self.enabled = False
+        self.frame_budget_ms = 1000 / 60
+        self.slow_callbacks = deque(maxlen=100)     # (widget path, callback, ms) for callbacks over budget
+        self._stats = {}
+        self._originals = []
+        self._counter = None
+        self._root = None
+        self._dump_after = None
+
+    def enable(self, root=None, frame_budget_ms=None, dump_every_ms=None, dump=None):
+        # Swaps traced wrappers into guiABLE's classes. Off, nothing is wrapped and tracing costs nothing.
+        # Mouse events look their handlers up as they fire, so they're traced from the next event; <Configure>
+        # bindings made before this keep calling the handlers they were bound to.
+        if frame_budget_ms is not None:
+            self.frame_budget_ms = frame_budget_ms
+        if not self.enabled:
+            self.enabled = True
+            module = sys.modules[__name__]
+            for cls in [obj for obj in vars(module).values() if isinstance(obj, type) and obj.__module__ == __name__]:
+                for name in self.HANDLERS:
+                    if name in cls.__dict__:
+                        self._originals.append((cls, name, cls.__dict__[name]))
+                        setattr(cls, name, self._wrap(f"{cls.__name__}.{name}", cls.__dict__[name]))
+            for name in self.FUNCTIONS:
+                self._originals.append((module, name, getattr(module, name)))
+                setattr(module, name, self._wrap(name, getattr(module, name)))
+            self._root = root or tk._default_root
+            if self._root is not None:
+                tk_app = self._root.tk
+                self._counter = CountingTk(tk_app)
+                for user in self._tkUsers():
+                    if user.tk is tk_app:
+                        user.tk = self._counter
+        if dump_every_ms:
+            self._scheduleDump(dump_every_ms, dump or (lambda report: print(report, file=sys.stderr)))
+
+    def disable(self):
+        if self.enabled:
+            for owner, name, original in reversed(self._originals):
+                setattr(owner, name, original)
+            self._originals = []
+            if self._root is not None:
+                if self._dump_after is not None:
+                    self._root.after_cancel(self._dump_after)
+                for user in self._tkUsers():
+                    if isinstance(user.tk, CountingTk):
+                        user.tk = user.tk._tk
+            self._counter = self._root = self._dump_after = None
+            self.enabled = False
+
+    def _widgets(self, widget):
+        yield widget
+        for child in list(widget.children.values()):
+            yield from self._widgets(child)
+
+    def _tkUsers(self):
+        # The widgets, and the PhotoImages they and the image cache hold: an image keeps the tkapp it was made with.
+        images = {}
+        for image in list(image_cache._images.values()) + list(image_cache._loading.values()):
+            images[image.name] = image
+        for widget in self._widgets(self._root):
+            yield widget
+            for value in list(vars(widget).values()):
+                for image in value if isinstance(value, (list, tuple)) else (value,):
+                    if isinstance(image, tk.Image):
+                        images[image.name] = image
+        yield from images.values()
+
+    def _wrap(self, name, function):
+        tracer = self
+
+        @wraps(function)
+        def traced(*args, **kwargs):
+            if not tracer.enabled:  # Bound while tracing, called after disable().
+                return function(*args, **kwargs)
+            counter = tracer._counter
+            calls = counter.calls if counter is not None else 0
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = (perf_counter() - start) * 1000
+                tracer._record(name, elapsed, counter.calls - calls if counter is not None else 0, args)
+        return traced
+
+    def _record(self, name, elapsed, tcl_calls, args):
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = {"calls": 0, "total_ms": 0.0, "max_ms": 0.0, "tcl_calls": 0,
+                                         "histogram": [0] * len(self.BUCKETS)}
+        stats["calls"] += 1
+        stats["total_ms"] += elapsed
+        stats["max_ms"] = max(stats["max_ms"], elapsed)
+        stats["tcl_calls"] += tcl_calls
+        stats["histogram"][bisect_right(self.BUCKETS[:-1], elapsed)] += 1
+        if name.endswith("._callFunction") and elapsed > self.frame_budget_ms:
+            widget = args[0] if args else None
+            self.slow_callbacks.append((str(widget), getattr(widget, "function", None), elapsed))
+            warn(f"guiABLE: {getattr(widget, 'function', None)!r} on {widget} ran {elapsed:.1f}ms, "
+                 f"over the {self.frame_budget_ms:.1f}ms frame budget; consider policy=\"thread\"", RuntimeWarning)
+
+    def stats(self):
+        out = {}
+        for name, stats in self._stats.items():
+            edges = [f"<={bound:g}ms" for bound in self.BUCKETS[:-1]] + [f">{self.BUCKETS[-2]:g}ms"]
+            out[name] = dict(stats, mean_ms=stats["total_ms"] / stats["calls"],
+                             histogram=dict(zip(edges, stats["histogram"])))
+        return out
+
+    def reset(self):
+        self._stats = {}
+        self.slow_callbacks.clear()
+
+    def report(self):
+        lines = [f"{'handler':<32} {'calls':>8} {'mean ms':>9} {'max ms':>9} {'tcl/call':>9}"]
+        for name, stats in sorted(self._stats.items(), key=lambda item: -item[1]["total_ms"]):
+            lines.append(f"{name:<32} {stats['calls']:>8} {stats['total_ms'] / stats['calls']:>9.3f} "
+                         f"{stats['max_ms']:>9.3f} {stats['tcl_calls'] / stats['calls']:>9.1f}")
+        lines += [f"slow callback {function!r} on {widget}: {ms:.1f}ms" for widget, function, ms in self.slow_callbacks]
+        return "\n".join(lines)
+
+    def _scheduleDump(self, every_ms, dump):
+        if self._root is None:
+            return
+
+        def tick():
+            dump(self.report())
+            self._dump_after = self._root.after(every_ms, tick) if self._root is not None else None
+        if self._dump_after is not None:
+            self._root.after_cancel(self._dump_after)
+        self._dump_after = self._root.after(every_ms, tick)
+
+
+tracer = Tracer()
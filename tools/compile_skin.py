@@ -0,0 +1,37 @@
+# Compiles a theme into one guiABLE skin file: every image it uses as PNG, plus its scroll bars composed ahead of
+# time at the sizes it lists, behind a manifest. Open it with guiABLE.SkinBundle; images decode on first use.
+#
+#   python tools/compile_skin.py UI/theme.json UI/theme.skin
+#
+# The theme is JSON, paths relative to it:
+#   {"backgrounds": {"panel": "panel.png"},
+#    "buttons": {"ok": ["ok.png", "ok_hover.png", "ok_down.png"]},
+#    "toggles": {"mute": [["mute_on.png", "mute_on_hover.png"], ["mute_off.png", "mute_off_hover.png"]]},
+#    "scrollbars": {"default": {"trough": ["trough.png", "trough_cap.png"], "handle": ["handle.png", null],
+#                               "sizes": [[16, 400], [16, 40], [16, 80]]}}}
+# Tk does the PNG decoding and encoding, so this needs a display (or Xvfb) like any other Tk program.
+import argparse
+import os
+import sys
+import tkinter as tk
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import guiABLE
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile a theme into a guiABLE skin file.")
+    parser.add_argument("theme", help="theme JSON file")
+    parser.add_argument("skin", help="path of the .skin file to write")
+    args = parser.parse_args(argv)
+
+    root = tk.Tk()
+    root.withdraw()
+    manifest = guiABLE.compileSkin(args.theme, args.skin)
+    root.destroy()
+    bars = sum(len(entry["bars"]) for entry in manifest["scrollbars"].values())
+    print(f"{args.skin}: {len(manifest['images'])} images ({bars} prebuilt bars), {os.path.getsize(args.skin)} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+# Packs loose skin images into one atlas: <index>.png plus a JSON index of named regions that any guiABLE image path
+# can reference as "<index>.json#<name>".
+#
+#   python tools/pack_atlas.py UI/ui.json UI/buttons/*.png UI/scroll/*.png
+#
+# Region names default to each file's path relative to the images' common folder, without extension.
+# Tk does the PNG decoding and encoding, so this needs a display (or Xvfb) like any other Tk program.
+import argparse
+import os
+import sys
+import tkinter as tk
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import guiABLE
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pack skin images into a guiABLE atlas.")
+    parser.add_argument("index", help="path of the JSON index to write; the sheet is written beside it as .png")
+    parser.add_argument("images", nargs="+", help="images to pack")
+    parser.add_argument("--max-width", type=int, default=1024, help="widest the sheet may grow (default 1024)")
+    parser.add_argument("--padding", type=int, default=1, help="pixels left between regions (default 1)")
+    args = parser.parse_args(argv)
+
+    root = tk.Tk()
+    root.withdraw()
+    regions = guiABLE.packAtlas(args.images, args.index, max_width=args.max_width, padding=args.padding)
+    root.destroy()
+    for name, (x, y, width, height) in sorted(regions.items()):
+        print(f"{args.index}#{name}  {width}x{height} at {x},{y}")
+
+
+if __name__ == "__main__":
+    main()